@@ -1,18 +1,261 @@
+from collections import OrderedDict
+import math
+import numpy as np
+
 h = 0.00001
+EPS = np.finfo(float).eps
+
+def df(f, x, method="forward"):
+    """
+    數值微分
+    method: "forward" 原本的前向差分 (固定 h)
+            "central" / "richardson" / "complex" 見下方各函數
+            "auto" 先試複數步長並用中央差分核對 (f 不是實解析函數時兩者不符，
+                   例如 abs)；不符或 f 不支援複數時改用 Richardson 外插
+    """
+    if method == "forward":
+        return (f(x+h)-f(x))/h
+    if method == "central":
+        return df_central(f, x)
+    if method == "richardson":
+        return df_richardson(f, x)[0]
+    if method == "complex":
+        return df_complex(f, x)
+    if method == "auto":
+        try:
+            d = df_complex(f, x)
+            ref = df_central(f, x)
+            if abs(d - ref) <= 1e-5 * max(1.0, abs(ref)):
+                return d
+        except (TypeError, ValueError, ArithmeticError):
+            pass
+        return df_richardson(f, x)[0]
+    raise ValueError(f"未知的微分方法: {method}")
+
+def df_central(f, x, step=None):
+    """中央差分，誤差 O(step^2)；預設步長 eps^(1/3) 讓截斷誤差與捨入誤差平衡"""
+    if step is None:
+        step = EPS ** (1/3) * max(1.0, abs(x))
+    return (f(x+step) - f(x-step)) / (2*step)
+
+def _richardson_table(f, x, step, levels):
+    """從 step 開始的一次 Richardson 外插表，輸出 (導數估計值, 誤差估計)"""
+    table = []
+    best, best_err = math.nan, math.inf
+    for i in range(levels):
+        # 求值失敗 (超出定義域、除以 0)、傳回複數 (例如負數的 x**0.5) 或不是有限值，
+        # 就停在目前最好的結果
+        try:
+            d = df_central(f, x, step)
+        except (TypeError, ValueError, ArithmeticError):
+            break
+        if isinstance(d, complex) or not math.isfinite(d):
+            break
+        row = [d]
+        for j in range(1, i + 1):
+            row.append(row[j-1] + (row[j-1] - table[i-1][j-1]) / (4**j - 1))
+            err = max(abs(row[j] - row[j-1]), abs(row[j] - table[i-1][j-1]))
+            if err <= best_err:
+                best, best_err = row[j], err
+        # 新一列的最高階結果反而比上一列差很多，表示捨入誤差開始主導，停止
+        if i > 0 and abs(row[i] - table[i-1][i-1]) >= 2 * best_err:
+            break
+        table.append(row)
+        step /= 2
+    return best, best_err
+
+def df_richardson(f, x, step=None, levels=8):
+    """
+    Richardson 外插: 用 step, step/2, step/4... 的中央差分消去高階誤差項
+    初始步長不超過 |x|/2，避免跨過 0 (例如 log、sqrt、1/x 的定義域邊界)；
+    f 變化的尺度可能比 step 小很多 (例如 sin(1e6))，外插表會假收斂，
+    所以步長每次縮小 1000 倍重做，直到相鄰兩次的結果在誤差範圍內一致
+    輸出: (導數估計值, 誤差估計)
+    """
+    if step is None:
+        step = 0.1 * max(1.0, abs(x))
+        if x != 0:
+            step = min(step, abs(x) / 2)
+    # 一直沒有一致時，回傳誤差估計最小的結果
+    best, best_err = math.nan, math.inf
+    prev = None
+    for _ in range(6):
+        d, err = _richardson_table(f, x, step, levels)
+        if prev is not None and abs(d - prev[0]) <= err + prev[1] + 1e-8 * max(1.0, abs(d)):
+            return min(prev, (d, err), key=lambda r: r[1])
+        if err < best_err:
+            best, best_err = d, err
+        prev = (d, err)
+        step /= 1000
+    return best, best_err
+
+def df_complex(f, x, step=1e-20):
+    """
+    複數步長微分 f'(x) ≈ Im(f(x + i*step)) / step
+    沒有相減抵銷的問題，step 可以取極小，精度接近機器精度；f 必須能接受複數 (實解析函數)
+    """
+    return f(complex(x, step)).imag / step
+
+def _simpson(fa, fm, fb, a, b):
+    """單一區間 [a, b] 的辛普森公式 (fm 為中點函數值)"""
+    return (b - a) * (fa + 4*fm + fb) / 6
+
+def integral_adaptive(f, a, b, tol=1e-10, max_depth=50, rel_tol=1e-12, max_evals=100000):
+    """
+    自適應辛普森積分 (Adaptive Simpson)
+    輸入: f 被積函數, [a, b] 積分區間, tol 絕對誤差容忍度, max_depth 最大細分層數,
+          rel_tol 相對誤差容忍度 (積分值很大時以它為準), max_evals 函數求值次數上限
+    輸出: (area, err) 積分估計值與誤差上界估計；超過 max_evals 時回傳目前的估計與其誤差
+    """
+    if a == b:
+        return 0.0, 0.0
+    if a > b:
+        area, err = integral_adaptive(f, b, a, tol, max_depth, rel_tol, max_evals)
+        return -area, err
+
+    fa, fm, fb = f(a), f((a+b)/2), f(b)
+    whole = _simpson(fa, fm, fb, a, b)
+    evals = 3
+    # 容忍度取絕對與相對的較大者，否則積分值很大時捨入誤差永遠大於 tol
+    tol = max(tol, rel_tol * abs(whole))
+
+    # 用堆疊取代遞迴: 每個項目為 (a, b, fa, fm, fb, 整段估計, 容忍度, 深度)
+    stack = [(a, b, fa, fm, fb, whole, tol, 0)]
+    area = 0.0
+    err = 0.0
+    while stack:
+        a, b, fa, fm, fb, whole, tol, depth = stack.pop()
+        m = (a + b) / 2
+        flm = f((a + m) / 2)
+        frm = f((m + b) / 2)
+        evals += 2
+        left = _simpson(fa, flm, fm, a, m)
+        right = _simpson(fm, frm, fb, m, b)
+        delta = left + right - whole
 
-def df(f, x):
-    return (f(x+h)-f(x))/h
+        # 左右兩半的和與整段估計差距夠小、差距已是捨入誤差等級、已達最大深度
+        # 或求值次數用完，就接受這一段
+        if (abs(delta) <= 15 * tol or abs(delta) <= 64 * EPS * (abs(left) + abs(right))
+                or depth >= max_depth or evals >= max_evals):
+            area += left + right + delta / 15  # Richardson 外插修正
+            err += abs(delta) / 15
+        else:
+            stack.append((a, m, fa, flm, fm, left, tol/2, depth+1))
+            stack.append((m, b, fm, frm, fb, right, tol/2, depth+1))
+    return area, err
 
-def integral(f, a, b):
-    x = a
-    area = 0
-    while x<b:
-        area += f(x)*h
-        x+=h
+def integral(f, a, b, tol=1e-10):
+    area, _ = integral_adaptive(f, a, b, tol)
     return area
 
+# ====== 向量化批次模式 ======
+def _eval_array(f, x):
+    """若 f 支援 NumPy 陣列就一次算完整個陣列，否則退回逐點呼叫"""
+    try:
+        y = np.asarray(f(x), dtype=float)
+    except (TypeError, ValueError):
+        y = None
+    if y is None or y.shape != x.shape:
+        if y is not None and y.ndim == 0:
+            return np.full(x.shape, float(y))  # 例如常數函數 lambda x: 1
+        y = np.array([f(v) for v in x.ravel()], dtype=float).reshape(x.shape)
+    return y
+
+def df_batch(f, xs):
+    """
+    中央差分，一次求出多個點的導數
+    輸入: f 函數, xs 一串 x 值 (list 或 ndarray)
+    輸出: 與 xs 相同形狀的導數陣列
+    """
+    xs = np.asarray(xs, dtype=float)
+    # x+h 與 x-h 疊在一起，只呼叫 f 一次
+    y = _eval_array(f, np.stack([xs + h, xs - h]))
+    return (y[0] - y[1]) / (2*h)
+
+def integral_batch(f, a, b, n=1000, method="simpson"):
+    """
+    在 np.linspace 網格上一次算出所有函數值再積分
+    輸入: f 函數, [a, b] 積分區間, n 區間數, method 為 "simpson" 或 "trapezoid"
+    輸出: 積分值
+    """
+    if method == "simpson" and n % 2 == 1:
+        n += 1  # 辛普森法需要偶數個區間
+    x = np.linspace(a, b, n + 1)
+    y = _eval_array(f, x)
+    dx = (b - a) / n
+    if method == "trapezoid":
+        return dx * (y.sum() - (y[0] + y[-1]) / 2)
+    if method == "simpson":
+        return dx / 3 * (y[0] + y[-1] + 4*y[1:-1:2].sum() + 2*y[2:-1:2].sum())
+    raise ValueError(f"未知的積分方法: {method}")
+
+# ====== 累積積分表 ======
+class CumulativeIntegral:
+    """
+    累積積分表 F(x) = ∫_a^x f(t) dt
+    在網格上一次算好前綴和，查詢時用三次 Hermite 內插 (節點斜率就是 f 本身)
+    """
+    def __init__(self, f, a, b, n=2000):
+        if not a < b:
+            raise ValueError("累積積分表需要 a < b")
+        self.f = f
+        self.a = a
+        self.b = b
+        self.n = n
+        self.dx = (b - a) / n
+
+        # 含中點共 2n+1 個點，一次批次求值
+        y = _eval_array(f, np.linspace(a, b, 2*n + 1))
+        self.x = np.linspace(a, b, n + 1)
+        self.y = y[::2]
+        # 每一格用辛普森法，再做前綴和
+        cells = self.dx / 6 * (y[:-1:2] + 4*y[1::2] + y[2::2])
+        self.F = np.concatenate([[0.0], np.cumsum(cells)])
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        if np.any((x < self.a) | (x > self.b)):
+            raise ValueError(f"x 超出累積積分表範圍 [{self.a}, {self.b}]")
+        i = np.clip(((x - self.a) / self.dx).astype(int), 0, self.n - 1)
+        t = (x - self.x[i]) / self.dx
+        t2, t3 = t*t, t*t*t
+        r = ((2*t3 - 3*t2 + 1) * self.F[i] + (t3 - 2*t2 + t) * self.dx * self.y[i]
+             + (3*t2 - 2*t3) * self.F[i+1] + (t3 - t2) * self.dx * self.y[i+1])
+        return float(r) if r.ndim == 0 else r
+
+CACHE_SIZE = 16
+_cumulative_cache = OrderedDict()
+
+def cumulative_integral(f, a, b, n=2000):
+    """取得 (f, a, b, n) 對應的累積積分表，最近最少使用 (LRU) 的表會被淘汰"""
+    key = (f, a, b, n)
+    if key in _cumulative_cache:
+        _cumulative_cache.move_to_end(key)
+        return _cumulative_cache[key]
+    table = CumulativeIntegral(f, a, b, n)
+    _cumulative_cache[key] = table
+    if len(_cumulative_cache) > CACHE_SIZE:
+        _cumulative_cache.popitem(last=False)
+    return table
+
+def theorem1_sweep(f, xs, tol=0.01, n=2000):
+    """
+    一次驗證多個點的微積分基本定理 d/dx ∫_0^x f(t) dt = f(x)
+    輸入: f 函數, xs 一串 x 值, tol 誤差容忍度, n 積分表格數
+    輸出: (誤差陣列, 是否全部通過)
+    """
+    xs = np.asarray(xs, dtype=float)
+    # 表格範圍要包含 0 以及差分會用到的 x±h
+    lo = min(0.0, float(xs.min())) - 2*h
+    hi = max(0.0, float(xs.max())) + 2*h
+    table = cumulative_integral(f, lo, hi, n)
+    r = df_batch(table, xs)
+    err = np.abs(r - _eval_array(f, xs))
+    return err, bool(np.all(err < tol))
+
 def theorem1(f, x):
-    r = df(lambda x:integral(f, 0, x), x)
+    # F(x+h) - F(x) 就是 ∫_x^{x+h} f，不必兩次都從 0 積分
+    r = integral(f, x, x+h) / h
     print('r=', r, 'f(x)=', f(x))
     print('abs(r-f(x))<0.01 = ', abs(r-f(x))<0.01)
     assert abs(r-f(x))<0.01
@@ -21,6 +264,14 @@ def f(x):
     return x**3
 
 print('df(f, 2)=', df(f, 2))
+print('df(f, 2, "richardson")=', df(f, 2, "richardson"))
+print('df(f, 2, "complex")=', df(f, 2, "complex"))
 print('integral(f, 0, 2)=', integral(f, 0, 2))
+print('integral_adaptive(f, 0, 2)=', integral_adaptive(f, 0, 2))
+print('df_batch(f, [0, 1, 2])=', df_batch(f, [0, 1, 2]))
+print('integral_batch(f, 0, 2)=', integral_batch(f, 0, 2))
+
+theorem1(f, 2)
 
-theorem1(f, 2)
\ No newline at end of file
+err, ok = theorem1_sweep(f, np.linspace(0, 2, 1000))
+print('theorem1_sweep: max err =', err.max(), 'ok =', ok)
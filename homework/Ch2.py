@@ -1,4 +1,5 @@
 import cmath
+import numpy as np
 
 def root (a,b,c):
     if a==0:
@@ -9,37 +10,107 @@ def root (a,b,c):
     return r1,r2
 
 
+def residual (a,b,c,x):
+    # Horner 法: ax^2+bx+c = (ax+b)x+c，純量與 ndarray 都適用
+    return (a*x + b)*x + c
+
+
 def df (a,b,c):
     try:
         r1,r2=root(a,b,c)
     except ValueError as e:
         return str(e),None,False
     
-    r1 , r2 = root(a, b, c)
-    df1 = a * (r1**2) + b*r1 +c
-    df2 = a * (r2**2) + b*r2 +c
+    df1 = residual(a, b, c, r1)
+    df2 = residual(a, b, c, r2)
 
     if cmath.isclose(df1,0,rel_tol=1e-09,abs_tol=1e-9)and cmath.isclose(df2,0,rel_tol=1e-09,abs_tol=1e-9):
         return df1,df2,True
     else:
         return df1,df2,False
-    
-print("測試1:重根")
-print (root(4,12,9))
-print (df(4,12,9))
 
-print("\n測試2:兩個實根")
-print (root(4,6,2))
-print (df(4,6,2))
 
-print("\n測試3:負數根")
-print (root(2,3,2))
-print (df(2,3,2))
+def _solve_batch(a, b, c):
+    """
+    root_batch 與 verify_batch 共用的核心: 求根並算一次殘差
+    輸出: (a, b, c, r1, r2, abs_err)，a, b, c 為 complex 陣列，abs_err 為兩根中較大的 |ax^2+bx+c|
+    """
+    a = np.asarray(a, dtype=complex)
+    b = np.asarray(b, dtype=complex)
+    c = np.asarray(c, dtype=complex)
+    valid = a != 0
+    safe_a = np.where(valid, a, 1)
+
+    sq = np.sqrt(b*b - 4*safe_a*c)
+    # 穩定公式: 讓 b 與 sqrt(ds) 同向相加，避免 -b+sqrt(ds) 的相減抵銷
+    sq = np.where((b.conjugate() * sq).real < 0, -sq, sq)
+    q = -(b + sq) / 2
+    nonzero_q = q != 0
+    safe_q = np.where(nonzero_q, q, 1)
+    r1 = np.where(nonzero_q, q / safe_a, 0)
+    r2 = np.where(nonzero_q, c / safe_q, 0)  # q=0 時 b=c=0，兩根都是 0
+
+    r1 = np.where(valid, r1, np.nan)
+    r2 = np.where(valid, r2, np.nan)
+    abs_err = np.maximum(np.abs(residual(a, b, c, r1)), np.abs(residual(a, b, c, r2)))
+    return a, b, c, r1, r2, abs_err
+
+
+def root_batch(a, b, c):
+    """
+    一次解多個二次方程式 ax^2 + bx + c = 0
+    輸入: a, b, c 係數陣列 (長度相同)
+    輸出: (r1, r2, ok) 兩個複數根陣列，ok 為驗證結果 (同 df 的判斷)；a=0 的列根為 nan，ok 為 False
+    """
+    a, b, c, r1, r2, abs_err = _solve_batch(a, b, c)
+    return r1, r2, (a != 0) & (abs_err <= 1e-9)
+
+
+def verify_batch(a, b, c, rel_tol=1e-9, abs_tol=1e-9):
+    """
+    一次求根並驗證 (每組方程式只解一次，殘差也只算一次)
+    輸出: dict
+        r1, r2   : 根
+        abs_err  : 兩根中較大的殘差 |ax^2+bx+c|
+        rel_err  : 殘差除以各項大小 |a||x|^2+|b||x|+|c|，與係數的尺度無關
+        ok       : abs_err <= max(rel_tol*尺度, abs_tol)；a=0 的列為 False
+    """
+    a, b, c, r1, r2, abs_err = _solve_batch(a, b, c)
+    # 同樣用 Horner 法算各項絕對值的和
+    scale = np.maximum(residual(np.abs(a), np.abs(b), np.abs(c), np.abs(r1)),
+                       residual(np.abs(a), np.abs(b), np.abs(c), np.abs(r2)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rel_err = np.where(scale > 0, abs_err / scale, 0.0)
+    rel_err = np.where(a != 0, rel_err, np.nan)
+    ok = (a != 0) & (abs_err <= np.maximum(rel_tol * scale, abs_tol))
+    return {"r1": r1, "r2": r2, "abs_err": abs_err, "rel_err": rel_err, "ok": ok}
+
+if __name__ == "__main__":
+    print("測試1:重根")
+    print (root(4,12,9))
+    print (df(4,12,9))
+
+    print("\n測試2:兩個實根")
+    print (root(4,6,2))
+    print (df(4,6,2))
+
+    print("\n測試3:負數根")
+    print (root(2,3,2))
+    print (df(2,3,2))
+
+    print("\n測試4:a=0")
+    try:
+        print (root(0,3,2))
+    except ValueError as e:
+        print("錯誤",e)
+
+    print(df(0,3,2))
 
-print("\n測試4:a=0")
-try:
-    print (root(0,3,2))
-except ValueError as e:
-    print("錯誤",e)
+    print("\n測試5:批次求解")
+    print(root_batch([4, 4, 2, 0], [12, 6, 3, 3], [9, 2, 2, 2]))
 
-print(df(0,3,2))
+    print("\n測試6:批次驗證")
+    result = verify_batch([4, 1, 2, 0], [12, -1e8, 3, 3], [9, 1, 2, 2])
+    print("abs_err =", result["abs_err"])
+    print("rel_err =", result["rel_err"])
+    print("ok =", result["ok"])
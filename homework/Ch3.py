@@ -1,4 +1,5 @@
 import cmath
+import numpy as np
 
 def root3(a,b,c,d):
     if a==0:
@@ -19,7 +20,8 @@ def root3(a,b,c,d):
     v_cub = (-q/2 - sqrt_delta)
 
     u = u_cub ** (1/3)
-    v = v_cub ** (1/3)
+    # v 不能單獨開立方，必須滿足 u*v = -p/3 才會配成正確的根
+    v = -p/(3*u) if u != 0 else v_cub ** (1/3)
 
     omega = [
         1, 
@@ -30,24 +32,84 @@ def root3(a,b,c,d):
     roots= []
     
     for k in range(3):
-        y = u_cub * omega[k] + v_cub * omega[(3-k) % 3]
+        y = u * omega[k] + v * omega[(3-k) % 3]
         x = y - b/3
         roots.append(x)
 
     return roots
 
-print("測試1:x^3-6x^2+11x-6=0(根為 1, 2, 3)")
-result1 = root3(1, -6, 11, -6)
-print([x.real if abs(x.imag) < 1e-10 else x for x in result1])
+def root3_batch(a, b, c, d):
+    """
+    一次解多個實係數三次方程式 ax^3 + bx^2 + cx + d = 0
+    三個實根時用三角函數解 (避開卡爾丹諾公式在實根時的複數開方誤差)，否則用卡爾丹諾公式，
+    最後對每個根做一次牛頓法修正。
+    輸入: a, b, c, d 係數陣列 (長度 N)
+    輸出: N x 3 的複數根陣列；a=0 的列為 nan
+    """
+    a = np.asarray(a, dtype=float)
+    valid = a != 0
+    safe_a = np.where(valid, a, 1.0)
+    B = np.asarray(b, dtype=float) / safe_a
+    C = np.asarray(c, dtype=float) / safe_a
+    D = np.asarray(d, dtype=float) / safe_a
 
-print("\n測試2:x^3-1=0(一個實根1，兩個複根)")
-result2 = root3(1, 0, 0, -1)
-print([x.real if abs(x.imag) < 1e-10 else x for x in result2])
+    p = C - B**2/3
+    q = 2*B**3/27 - B*C/3 + D
+    delta = (q/2)**2 + (p/3)**3
+    three_real = delta < 0  # 此時必有 p < 0
 
-print("\n測試3:x^3-3x^2+3x-1=0(重根,(x-1)^3 = 0)")
-result3 = root3(1, -3, 3, -1)
-print([x.real if abs(x.imag)<1e-10 else x for x in result3])
+    y = np.empty(a.shape + (3,), dtype=complex)
 
-print("\n測試4:x^3 - x = 0 (根為 0, 1, -1)")
-result4 = root3(1, 0, -1, 0)
-print([x.real if abs(x.imag) < 1e-10 else x for x in result4])
\ No newline at end of file
+    # --- 三個實根: 三角函數解 ---
+    pr, qr = p[three_real], q[three_real]
+    m = 2*np.sqrt(-pr/3)
+    theta = np.arccos(np.clip(3*qr/(pr*m), -1.0, 1.0)) / 3
+    for k in range(3):
+        y[three_real, k] = m*np.cos(theta - 2*np.pi*k/3)
+
+    # --- 一實根兩共軛複根 (或重根): 卡爾丹諾公式 ---
+    card = ~three_real
+    pc, qc = p[card], q[card]
+    # 取絕對值較大的那一個開立方，避免 -q/2 + sqrt(delta) 相減抵銷
+    w = -qc/2 - np.where(qc >= 0, 1.0, -1.0)*np.sqrt(delta[card])
+    u = np.cbrt(w)
+    nonzero_u = u != 0
+    v = np.where(nonzero_u, -pc/(3*np.where(nonzero_u, u, 1.0)), 0.0)
+    y[card, 0] = u + v
+    y[card, 1] = -(u + v)/2 + 1j*np.sqrt(3)/2*(u - v)
+    y[card, 2] = -(u + v)/2 - 1j*np.sqrt(3)/2*(u - v)
+
+    x = y - (B/3)[..., None]
+
+    # --- 牛頓法修正一步 (只在殘差變小時採用) ---
+    B3, C3, D3 = B[..., None], C[..., None], D[..., None]
+    f = ((x + B3)*x + C3)*x + D3
+    fp = (3*x + 2*B3)*x + C3
+    nonzero_fp = fp != 0
+    x_new = np.where(nonzero_fp, x - f/np.where(nonzero_fp, fp, 1.0), x)
+    f_new = ((x_new + B3)*x_new + C3)*x_new + D3
+    x = np.where(np.abs(f_new) < np.abs(f), x_new, x)
+
+    x[~valid] = np.nan
+    return x
+
+if __name__ == "__main__":
+    print("測試1:x^3-6x^2+11x-6=0(根為 1, 2, 3)")
+    result1 = root3(1, -6, 11, -6)
+    print([x.real if abs(x.imag) < 1e-10 else x for x in result1])
+
+    print("\n測試2:x^3-1=0(一個實根1，兩個複根)")
+    result2 = root3(1, 0, 0, -1)
+    print([x.real if abs(x.imag) < 1e-10 else x for x in result2])
+
+    print("\n測試3:x^3-3x^2+3x-1=0(重根,(x-1)^3 = 0)")
+    result3 = root3(1, -3, 3, -1)
+    print([x.real if abs(x.imag)<1e-10 else x for x in result3])
+
+    print("\n測試4:x^3 - x = 0 (根為 0, 1, -1)")
+    result4 = root3(1, 0, -1, 0)
+    print([x.real if abs(x.imag) < 1e-10 else x for x in result4])
+
+    print("\n測試5:批次求解")
+    result5 = root3_batch([1, 1, 1, 1], [-6, 0, -3, 0], [11, 0, 3, -1], [-6, -1, -1, 0])
+    print(np.real_if_close(np.round(result5, 10)))
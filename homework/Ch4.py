@@ -1,8 +1,18 @@
 import numpy as np
+from Ch2 import root_batch as root2_batch
+from Ch3 import root3_batch
 
-def root(c):
-    TOL = 1e-10
-    
+TOL = 1e-10
+ABERTH_DEGREE = 100  # roots() 在次數超過這個值時改用 Aberth 迭代法
+CHUNK = 512          # Aberth 每次處理的列數，暫存記憶體為 CHUNK x n
+EPS = np.finfo(float).eps
+
+def root(c, method="companion", return_info=False):
+    """
+    method: "companion" 同伴矩陣特徵值 (O(n^3) 時間, O(n^2) 記憶體)
+            "aberth"    Aberth-Ehrlich 同步迭代 (每次迭代 O(n^2) 時間, O(n) 記憶體)
+    return_info=True 且 method="aberth" 時回傳 (roots, info)，info 為收斂統計
+    """
     c = np.array(c, dtype=float)
     if c.size == 0:
         return "輸入列表為空,不是多項式"
@@ -30,6 +40,13 @@ def root(c):
         return "最高次係數接近0，請檢查輸入"
     
     c_norm = c / leading_coeff 
+
+    if method == "aberth":
+        roots, info = aberth(c_norm)
+        roots = np.real_if_close(roots, tol=1e-8)
+        return (roots, info) if return_info else roots
+    if method != "companion":
+        raise ValueError(f"未知的求根方法: {method}")
     
     a = c_norm[:-1]  
    
@@ -42,5 +59,187 @@ def root(c):
     roots = np.real_if_close(roots, tol=1e-8)
     return roots
 
-print(root([1, -7, 14, -8]))
-print(root([-1, -1, 0, 0, 0, 1]))
\ No newline at end of file
+def root_batch(C):
+    """
+    一次求多個同次數多項式的根
+    輸入: C 為 m x (n+1) 係數矩陣，每列升冪排列，最高次係數不可為 0
+    輸出: m x n 根陣列 (一次配置 m x n x n 的同伴矩陣堆疊，再用批次 eigvals)
+    """
+    C = np.asarray(C, dtype=float)
+    if C.ndim != 2 or C.shape[1] < 2:
+        raise ValueError("輸入必須是 m x (n+1) 的係數矩陣，n >= 1")
+    leading = C[:, -1]
+    if np.any(np.abs(leading) < TOL):
+        raise ValueError("最高次係數接近0，請檢查輸入")
+    m, n = C.shape[0], C.shape[1] - 1
+
+    companion = np.zeros((m, n, n))
+    idx = np.arange(n - 1)
+    companion[:, idx + 1, idx] = 1.0                      # 次對角線
+    companion[:, 0, :] = -C[:, -2::-1] / leading[:, None]  # 第一列放正規化後的係數
+    roots = np.linalg.eigvals(companion)
+    return np.real_if_close(roots, tol=1e-8)
+
+def _newton_ratio(c, z):
+    """
+    計算 p(z)/p'(z) (c 升冪排列)
+    |z| > 1 時改用倒序多項式 q(y) = y^n p(1/y) 求值，避免高次方溢位：
+    p(z)/p'(z) = z q(y) / (n q(y) - y q'(y)), y = 1/z
+    同時回傳 |p(z)| 是否已低於 Horner 求值的捨入誤差 (Higham 的 running error bound:
+    μ 沿著 Horner 累加 |z|·μ + |部分和|，誤差 <= eps·(2μ - |p|))，此時 p(z) 只剩捨入雜訊
+    """
+    n = len(c) - 1
+    ratio = np.empty_like(z)
+    at_noise = np.empty(len(z), dtype=bool)
+    inside = np.abs(z) <= 1
+
+    zi = z[inside]
+    p = np.full_like(zi, c[n])
+    dp = np.zeros_like(zi)
+    mu = np.abs(p) / 2
+    for k in range(n - 1, -1, -1):
+        dp = dp*zi + p
+        p = p*zi + c[k]
+        mu = mu*np.abs(zi) + np.abs(p)
+    ratio[inside] = p / dp
+    at_noise[inside] = np.abs(p) <= EPS * (2*mu - np.abs(p))
+
+    zo = z[~inside]
+    y = 1 / zo
+    q = np.full_like(y, c[0])
+    dq = np.zeros_like(y)
+    mu = np.abs(q) / 2
+    for k in range(1, n + 1):
+        dq = dq*y + q
+        q = q*y + c[k]
+        mu = mu*np.abs(y) + np.abs(q)
+    ratio[~inside] = zo*q / (n*q - y*dq)
+    at_noise[~inside] = np.abs(q) <= EPS * (2*mu - np.abs(q))
+    return ratio, at_noise
+
+def aberth(c, tol=1e-12, max_iter=500):
+    """
+    Aberth-Ehrlich 法同時求出首一多項式 (升冪排列，c[-1] = 1) 的所有根
+    z_k <- z_k - w_k / (1 - w_k * Σ_{j≠k} 1/(z_k - z_j)),  w_k = p(z_k)/p'(z_k)
+    輸出: (roots, info)，info 包含 iterations, converged, max_correction,
+          at_rounding_level (因 |p(z)| 已達捨入誤差而停止的根數)
+    每個根在修正量 <= tol·max(|z|, 1) 或 |p(z)| 低於捨入誤差上界時停止；
+    重根或密集的根修正量只會停在捨入雜訊，靠後者才能判定收斂
+    """
+    c = np.asarray(c, dtype=complex)
+    n = len(c) - 1
+
+    # 去掉 0 根 (常數項為 0 的部分)，剩下的多項式常數項不為 0
+    zeros = 0
+    while zeros < n and c[zeros] == 0:
+        zeros += 1
+    if zeros == n:
+        return np.zeros(n, dtype=complex), {"iterations": 0, "converged": True, "max_correction": 0.0,
+                                            "at_rounding_level": 0}
+    if zeros:
+        z, info = aberth(c[zeros:], tol, max_iter)
+        return np.concatenate([np.zeros(zeros, dtype=complex), z]), info
+
+    # 初始值: 放在半徑為 |c0|^(1/n) (所有根絕對值的幾何平均) 的圓上，稍微旋轉避免落在對稱軸
+    radius = abs(c[0]) ** (1.0 / n)
+    z = radius * np.exp(1j * (2*np.pi*np.arange(n)/n + 0.4))
+
+    active = np.ones(n, dtype=bool)
+    max_correction = np.inf
+    at_rounding_level = 0
+    previous = np.full(n, np.inf)  # 每個根上一次的修正量
+    for it in range(1, max_iter + 1):
+        idx = np.flatnonzero(active)
+        w, at_noise = _newton_ratio(c, z[idx])
+        # 分塊計算 Σ 1/(z_k - z_j)，記憶體只需 CHUNK x n
+        s = np.empty(len(idx), dtype=complex)
+        for start in range(0, len(idx), CHUNK):
+            rows = idx[start:start + CHUNK]
+            diff = z[rows, None] - z[None, :]
+            diff[np.arange(len(rows)), rows] = np.inf  # j = k 的項為 0
+            s[start:start + CHUNK] = np.sum(1 / diff, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correction = w / (1 - w*s)
+        correction = np.where(np.isfinite(correction), correction, 0)
+        z[idx] -= correction
+
+        max_correction = float(np.max(np.abs(correction)))
+        size = np.abs(correction)
+        small = size <= tol * np.maximum(np.abs(z[idx]), 1.0)
+        # p(z) 已是捨入雜訊且修正量不再明顯變小: 這個根已經到浮點數能分辨的極限
+        stalled = at_noise & ~small & (size > 0.5 * previous[idx])
+        previous[idx] = size
+        at_rounding_level += int(np.count_nonzero(stalled))
+        active[idx[small | stalled]] = False
+        if not active.any():
+            return z, {"iterations": it, "converged": True, "max_correction": max_correction,
+                       "at_rounding_level": at_rounding_level}
+    return z, {"iterations": max_iter, "converged": False, "max_correction": max_correction,
+               "at_rounding_level": at_rounding_level}
+
+def _trim(c):
+    """去掉最高次項接近 0 的係數 (升冪排列)"""
+    c = np.array(c, dtype=float)
+    n = len(c)
+    while n > 0 and abs(c[n-1]) < TOL:
+        n -= 1
+    if n <= 1:
+        raise ValueError("次數小於 1，不是可求根的多項式")
+    return c[:n]
+
+def _closed_form(group):
+    """group: 同次數 (1~3) 的係數矩陣，每列升冪排列；回傳每列的根"""
+    n = group.shape[1] - 1
+    if n == 1:
+        return (-group[:, 0] / group[:, 1])[:, None].astype(complex)
+    if n == 2:
+        r1, r2, _ = root2_batch(group[:, 2], group[:, 1], group[:, 0])
+        return np.stack([r1, r2], axis=1)
+    return root3_batch(group[:, 3], group[:, 2], group[:, 1], group[:, 0])
+
+def roots(c):
+    """
+    統一的求根入口 (係數升冪排列，同 root)
+    次數 <= 3 用公式解 (Ch2/Ch3)，更高次才用同伴矩陣
+    """
+    c = _trim(c)
+    if len(c) - 1 <= 3:
+        r = _closed_form(c[None, :])[0]
+    elif len(c) - 1 > ABERTH_DEGREE:
+        r = root(c, method="aberth")
+    else:
+        r = root(c)
+    return np.real_if_close(r, tol=1e-8)
+
+def roots_many(polys):
+    """
+    一次求多個多項式的根：依次數分組，每組一起向量化計算
+    輸出: 與輸入順序相同的根陣列 list
+    """
+    trimmed = [_trim(c) for c in polys]
+    groups = {}
+    for i, c in enumerate(trimmed):
+        groups.setdefault(len(c) - 1, []).append(i)
+
+    results = [None] * len(trimmed)
+    for n, idx in groups.items():
+        if n <= 3:
+            group_roots = _closed_form(np.array([trimmed[i] for i in idx]))
+        elif n > ABERTH_DEGREE:
+            group_roots = [root(trimmed[i], method="aberth") for i in idx]
+        else:
+            group_roots = root_batch(np.array([trimmed[i] for i in idx]))
+        for i, r in zip(idx, group_roots):
+            results[i] = np.real_if_close(r, tol=1e-8)
+    return results
+
+if __name__ == "__main__":
+    print(root([1, -7, 14, -8]))
+    print(root([-1, -1, 0, 0, 0, 1]))
+
+    print(root([-1, -1, 0, 0, 0, 1], method="aberth", return_info=True))
+
+    print(root_batch([[1, -7, 14, -8], [-6, 11, -6, 1]]))
+
+    print(roots([-6, 11, -6, 1]))
+    print(roots_many([[2, 3], [2, 6, 4], [-6, 11, -6, 1], [-1, -1, 0, 0, 0, 1], [-2, 1]]))
\ No newline at end of file
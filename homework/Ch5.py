@@ -1,114 +1,886 @@
+from collections.abc import Sequence
+from functools import lru_cache
+import random
+import numpy as np
+
+
+def _small_primes(limit):
+    """埃拉托斯特尼篩法，產生小於 limit 的質數"""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytearray(len(range(i*i, limit, i)))
+    return [i for i in range(limit) if sieve[i]]
+
+
+SMALL_PRIMES = _small_primes(1000)
+# 這組底數對 n < 3.3 * 10^24 (涵蓋所有 64 位元整數) 的 Miller-Rabin 判斷是確定的，
+# 更大的 n 則是機率性判斷 (誤判機率小於 4^-13)
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
 def is_prime(n):
     if n < 2:
         return False
-    if n == 2:
+    # 先用小質數過濾，大部分合數在這裡就被排除
+    for q in SMALL_PRIMES:
+        if n % q == 0:
+            return n == q
+    if n < SMALL_PRIMES[-1] ** 2:
         return True
-    if n % 2 == 0:
-        return False
-    i = 3
-    while i * i <= n:
-        if n % i == 0:
+
+    # Miller-Rabin: n-1 = d * 2^s
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
             return False
-        i += 2
     return True
 
 
+@lru_cache(maxsize=1024)
+def next_prime(n):
+    """大於等於 n 的最小質數"""
+    if n <= 2:
+        return 2
+    n |= 1  # 只看奇數
+    while not is_prime(n):
+        n += 2
+    return n
+
+
+def random_prime(bits, seed=None):
+    """隨機產生一個 bits 位元的質數 (最高位固定為 1)"""
+    if bits < 2:
+        raise ValueError("bits 至少要 2")
+    rng = random.Random(seed)
+    while True:
+        p = next_prime(rng.getrandbits(bits) | (1 << (bits - 1)))
+        if p.bit_length() == bits:
+            return p
+
+
 class GFElement:
-    """GF(p) 元素"""
-    def __init__(self, value, field: 'FiniteField'):
-        self.value = value % field.p
-        self.field = field
+    """GF(p) 元素 (不可變；小的體會共用同一個元素物件)"""
+    __slots__ = ("value", "field")
+
+    def __new__(cls, value, field: 'FiniteField'):
+        return _make_element(value % field.order, field)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GFElement 是不可變的")
 
     def __repr__(self):
-        return f"GF({self.field.p})[{self.value}]"
+        return f"{self.field.name}[{self.value}]"
 
+    # 運算結果已經落在 0..order-1，直接用 _make_element 建立，不再取模；
+    # 另一個運算元最常見的是 GFElement，先用 type() 判斷走最短的路徑；
+    # 質數體的加減乘直接取模，省掉一次方法呼叫 (擴張體才交給 field 的方法)
     def __add__(self, other):
-        other_val = other.value if isinstance(other, GFElement) else other
-        return GFElement((self.value + other_val) % self.field.p, self.field)
+        if type(other) is GFElement:
+            other_val = other.value
+        elif isinstance(other, (GFArray, np.ndarray)):
+            return NotImplemented  # 交給陣列的反向運算
+        else:
+            other_val = other
+        field = self.field
+        if field.prime_field:
+            return _make_element((self.value + other_val) % field.p, field)
+        return _make_element(field.add(self.value, other_val), field)
     __radd__ = __add__
 
     def __sub__(self, other):
-        other_val = other.value if isinstance(other, GFElement) else other
-        return GFElement((self.value - other_val) % self.field.p, self.field)
+        if type(other) is GFElement:
+            other_val = other.value
+        elif isinstance(other, (GFArray, np.ndarray)):
+            return NotImplemented  # 交給陣列的反向運算
+        else:
+            other_val = other
+        field = self.field
+        if field.prime_field:
+            return _make_element((self.value - other_val) % field.p, field)
+        return _make_element(field.sub(self.value, other_val), field)
 
     def __rsub__(self, other):
-        return GFElement((other - self.value) % self.field.p, self.field)
+        return _make_element(self.field.sub(other, self.value), self.field)
 
     def __mul__(self, other):
-        other_val = other.value if isinstance(other, GFElement) else other
-        return GFElement((self.value * other_val) % self.field.p, self.field)
+        if type(other) is GFElement:
+            other_val = other.value
+        elif isinstance(other, (GFArray, np.ndarray)):
+            return NotImplemented  # 交給陣列的反向運算
+        else:
+            other_val = other
+        field = self.field
+        if field.prime_field:
+            return _make_element(self.value * other_val % field.p, field)
+        return _make_element(field.mul(self.value, other_val), field)
     __rmul__ = __mul__
 
     def __neg__(self):
-        return GFElement(-self.value % self.field.p, self.field)
+        return _make_element(self.field.neg(self.value), self.field)
 
     def __truediv__(self, other):
-        other_val = other.value if isinstance(other, GFElement) else (other % self.field.p)
-        if other_val == 0:
-            raise ZeroDivisionError("division by zero in finite field")
-        inv = pow(other_val, -1, self.field.p)
-        return GFElement((self.value * inv) % self.field.p, self.field)
+        if type(other) is GFElement:
+            other_val = other.value
+        elif isinstance(other, (GFArray, np.ndarray)):
+            return NotImplemented  # 交給陣列的反向運算
+        else:
+            other_val = other
+        field = self.field
+        if field.prime_field:
+            return _make_element(self.value * field.inv(other_val) % field.p, field)
+        return _make_element(field.div(self.value, other_val), field)
 
     def __rtruediv__(self, other):
-        if self.value == 0:
-            raise ZeroDivisionError("division by zero in finite field")
-        inv = pow(self.value, -1, self.field.p)
-        return GFElement((other * inv) % self.field.p, self.field)
+        return _make_element(self.field.div(other, self.value), self.field)
+
+    def __pow__(self, e):
+        return _make_element(self.field.pow(self.value, e), self.field)
+
+    def __int__(self):
+        return self.value
+
+    def __reduce__(self):
+        # __new__ 需要 (value, field)；copy / pickle 重建時一樣經過快取
+        return (GFElement, (self.value, self.field))
 
     def __eq__(self, other):
         if isinstance(other, GFElement):
-            # 修正：比較 p 而非 field 物件
-            return self.value == other.value and self.field.p == other.field.p
-        return self.value == (other % self.field.p)
+            # 修正：比較體的參數 (p, 元素個數, 模多項式) 而非 field 物件
+            return self.value == other.value and self.field.key == other.field.key
+        return self.value == (other % self.field.order)
+
+    def __hash__(self):
+        # 與等於它的整數 (0..order-1) 雜湊相同，GF(7)[3] 與 3 可以互相當 dict 的鍵；
+        # 不同體的同值元素雜湊相同，但 __eq__ 會比較 field.key 區分
+        return hash(self.value)
+
+
+_set_value = GFElement.value.__set__
+_set_field = GFElement.field.__set__
+
+def _make_element(value, field):
+    """建立元素，value 必須已經在 0..order-1 (各運算的結果都已取模)"""
+    cache = field._interned
+    if cache is not None:
+        element = cache[value]
+        if element is not None:
+            return element
+    element = object.__new__(GFElement)
+    _set_value(element, value)
+    _set_field(element, field)
+    if cache is not None:
+        cache[value] = element
+    return element
+
+
+class _ElementRange(Sequence):
+    """體中 start..order-1 的元素序列，需要時才建立元素，不佔 O(p) 記憶體"""
+    def __init__(self, field, start):
+        self.field = field
+        self.start = start
+
+    def __len__(self):
+        return self.field.order - self.start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("index out of range")
+        return GFElement(self.start + i, self.field)
+
+    def __iter__(self):
+        for v in range(self.start, self.field.order):
+            yield GFElement(v, self.field)
+
+    def __contains__(self, x):
+        # O(1) 判斷，不必線性搜尋
+        if isinstance(x, GFElement):
+            return x.field.key == self.field.key and x.value >= self.start
+        return False
+
+
+def prime_factors(n):
+    """n 的相異質因數 (試除法)"""
+    factors = []
+    d = 2
+    while d * d <= n:
+        if n % d == 0:
+            factors.append(d)
+            while n % d == 0:
+                n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def primitive_root(p):
+    """找出 GF(p) 乘法群的生成元 g (g 的 (p-1)/q 次方對每個質因數 q 都不為 1)"""
+    if p == 2:
+        return 1
+    factors = prime_factors(p - 1)
+    for g in range(2, p):
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
+    raise ValueError(f"GF({p}) 找不到生成元")
+
+
+# 超過這個大小就不建表，直接用模運算
+TABLE_LIMIT = 1 << 16
+# 建立凱萊表時每次處理的列數
+CAYLEY_BLOCK = 256
+# 群公理檢測未指定 samples 時: 元素個數不超過這個值才窮舉 (結合律是 O(p^3)，p = 1009 約 12 秒)，
+# 否則隨機抽 DEFAULT_SAMPLES 組
+EXHAUSTIVE_LIMIT = 256
+DEFAULT_SAMPLES = 10000
+# 元素個數不超過這個值時，同一個體的相同元素共用同一個物件 (重複使用比每次建立新物件快；
+# 快取表是 order 個位置的 list，元素本身用到才建立)
+INTERN_LIMIT = 1 << 15
 
 
 class FiniteField:
     """有限體 GF(p)"""
-    def __init__(self, p):
+    def __init__(self, p, use_tables=True):
         if not is_prime(p):
             raise ValueError(f"{p} 不是質數，無法建構 GF(p)")
         self.p = p
-        self.add_elements = [GFElement(i, self) for i in range(p)]
-        self.mul_elements = [GFElement(i, self) for i in range(1, p)]
+        self.order = p
+        self.name = f"GF({p})"
+        self.key = (p, p)
+        self.prime_field = True
+        self._setup(use_tables)
+
+    def _setup(self, use_tables):
+        self._interned = [None] * self.order if self.order <= INTERN_LIMIT else None
+
+        # 對數/反對數表: g^log[a] = a，乘除與次方都變成查表
+        self.use_tables = use_tables and self.order <= TABLE_LIMIT
+        if self.use_tables:
+            self._build_tables()
+
+    # 元素快取不存進 pickle (快取裡的元素又指回 field)，還原後重新建立空的快取
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_interned"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._interned = [None] * self.order if self.order <= INTERN_LIMIT else None
+
+    @classmethod
+    def random(cls, bits, seed=None, use_tables=True):
+        """建立一個隨機 bits 位元質數的 GF(p)"""
+        return cls(random_prime(bits, seed), use_tables)
+
+    def _find_generator(self):
+        return primitive_root(self.p)
+
+    def _build_tables(self):
+        q = self.order
+        self.generator = self._find_generator()
+        # exp 表長度 2(q-1)，相加後的對數不必再取模
+        self.exp_table = [1] * (2 * (q - 1))
+        self.log_table = [0] * q
+        x = 1
+        for i in range(q - 1):
+            self.exp_table[i] = x
+            self.exp_table[i + q - 1] = x
+            self.log_table[x] = i
+            x = self._mul_raw(x, self.generator)
+        self.inv_table = [0] + [self.exp_table[q - 1 - self.log_table[a]] for a in range(1, q)]
+
+    @property
+    def add_elements(self):
+        return _ElementRange(self, 0)
+
+    @property
+    def mul_elements(self):
+        return _ElementRange(self, 1)
 
     def element(self, value):
         return GFElement(value, self)
 
+    def array(self, data):
+        return GFArray(data, self)
+
+    # ====== 整數層級的運算 (反元素、除、次方有表時查表) ======
+    # 子類別 (例如 GF(p^k)) 只要改寫 add/sub/neg 與 _mul_raw/_inv_raw/_pow_raw
+    def add(self, a, b):
+        return (a + b) % self.p
+
+    def sub(self, a, b):
+        return (a - b) % self.p
+
+    def neg(self, a):
+        return -a % self.p
+
+    def _mul_raw(self, a, b):
+        return a * b % self.p
+
+    def _inv_raw(self, a):
+        return pow(a, -1, self.p)
+
+    def _pow_raw(self, a, e):
+        return pow(a, e, self.p)
+
+    def mul(self, a, b):
+        # 質數體的乘法直接取模比查兩次對數表快；表只用在反元素、除法與次方
+        return a * b % self.p
+
+    def inv(self, a):
+        a %= self.order
+        if a == 0:
+            raise ZeroDivisionError("division by zero in finite field")
+        if self.use_tables:
+            return self.inv_table[a]
+        return self._inv_raw(a)
+
+    def div(self, a, b):
+        return self.mul(a, self.inv(b))
+
+    def pow(self, a, e):
+        a %= self.order
+        if a == 0:
+            if e < 0:
+                raise ZeroDivisionError("division by zero in finite field")
+            return 0 if e > 0 else 1
+        if not self.use_tables:
+            return self._pow_raw(a, e)
+        return self.exp_table[self.log_table[a] * e % (self.order - 1)]
+
+    # ====== 凱萊表 (Cayley table) ======
+    def _vectorize(self, op, nargs):
+        """
+        把 field 的整數運算 (add/neg/mul/inv ...) 套用到整個陣列
+        質數體的 add/neg/mul 本身就是 NumPy 運算，其他的逐元素呼叫；
+        兩者都經過 field 自己的方法，所以運算或表有錯時檢測會失敗
+        """
+        fn = getattr(self, op)
+        if self.prime_field and op in ("add", "neg", "mul"):
+            return fn
+        return np.frompyfunc(fn, nargs, 1)
+
+    def cayley_table(self, op):
+        """op 為 "add" 或 "mul"，回傳 p x p 運算表 (只建一次)"""
+        name = "_" + op + "_table"
+        if getattr(self, name, None) is None:
+            p = self.order
+            fn = self._vectorize(op, 2)
+            i = np.arange(p, dtype=np.int64)
+            table = np.empty((p, p), dtype=np.int64)
+            # 分塊計算，暫存的 int64 乘積不必一次配置 p x p
+            for start in range(0, p, CAYLEY_BLOCK):
+                table[start:start + CAYLEY_BLOCK] = fn(i[start:start + CAYLEY_BLOCK, None], i)
+            setattr(self, name, table.astype(np.int32) if p <= np.iinfo(np.int32).max else table)
+        return getattr(self, name)
+
+    def _check_associativity(self, T, elems):
+        """(a∘b)∘c == a∘(b∘c)，窮舉: 每次固定 a，對 b, c 廣播"""
+        bc = T[np.ix_(elems, elems)]
+        return all(
+            np.array_equal(T[np.ix_(T[a, elems], elems)], T[a, bc])
+            for a in elems
+        )
+
+    def _check_inverse(self, T, elems, op, identity):
+        """用 field 的 neg/inv 算出每個元素的反元素，再查表確認 a∘a^-1 == 單位元素"""
+        inverses = np.asarray(self._vectorize(op, 1)(elems), dtype=np.int64)
+        if not np.all((inverses >= 0) & (inverses < self.order)):
+            return False
+        return bool(np.all(T[elems, inverses] == identity))
+
+    def _sample(self, low, samples, seed):
+        """隨機抽 3 組整數陣列 (值介於 low..order-1)，不需要建立 p x p 的表"""
+        if (self.order - 1) ** 2 <= np.iinfo(np.int64).max:
+            return np.random.default_rng(seed).integers(low, self.order, size=(3, samples))
+        # 乘積放不進 int64 時用 Python 整數
+        rng = random.Random(seed)
+        return np.array([[rng.randrange(low, self.order) for _ in range(samples)] for _ in range(3)], dtype=object)
+
+    def _in_range(self, x, low=0):
+        return bool(np.all((x >= low) & (x < self.order)))
+
+    def _exhaustive(self, samples):
+        """samples=None 時，元素個數 <= EXHAUSTIVE_LIMIT 才窮舉，否則抽 DEFAULT_SAMPLES 組"""
+        if samples is None:
+            return (True, None) if self.order <= EXHAUSTIVE_LIMIT else (False, DEFAULT_SAMPLES)
+        return False, samples
+
     # ====== 群公理檢測 ======
-    def test_add_group(self):
+    # 窮舉用凱萊表 (結合律是 O(p^3))；抽樣只檢查隨機的 a, b, c，適用於很大的 p。
+    # 兩種方式都只透過 field 的 add/neg/mul/inv 計算
+    def test_add_group(self, samples=None, seed=None):
+        exhaustive, samples = self._exhaustive(samples)
+        if not exhaustive:
+            add, neg = self._vectorize("add", 2), self._vectorize("neg", 1)
+            a, b, c = self._sample(0, samples, seed)
+            ab = add(a, b)
+            return {
+                "closure": self._in_range(ab),
+                "associativity": bool(np.all(add(ab, c) == add(a, add(b, c)))),
+                "identity": bool(np.all(add(a, 0) == a)),
+                "inverse": bool(np.all(add(a, neg(a)) == 0))
+            }
+        T = self.cayley_table("add")
+        elems = np.arange(self.order)
+        closure = self._in_range(T)
         results = {
-            "closure": all(a + b in self.add_elements for a in self.add_elements for b in self.add_elements),
-            "associativity": all((a + b) + c == a + (b + c) 
-                                 for a in self.add_elements for b in self.add_elements for c in self.add_elements),
-            "identity": all(a + self.element(0) == a for a in self.add_elements),
-            "inverse": all(a + (-a) == self.element(0) for a in self.add_elements)
+            "closure": closure,
+            "associativity": closure and self._check_associativity(T, elems),
+            "identity": bool(np.array_equal(T[:, 0], elems)),
+            "inverse": self._check_inverse(T, elems, "neg", 0)
         }
         return results
 
-    def test_mul_group(self):
+    def test_mul_group(self, samples=None, seed=None):
+        exhaustive, samples = self._exhaustive(samples)
+        if not exhaustive:
+            mul, inv = self._vectorize("mul", 2), self._vectorize("inv", 1)
+            a, b, c = self._sample(1, samples, seed)
+            ab = mul(a, b)
+            return {
+                "closure": self._in_range(ab, 1),
+                "associativity": bool(np.all(mul(ab, c) == mul(a, mul(b, c)))),
+                "identity": bool(np.all(mul(a, 1) == a)),
+                "inverse": bool(np.all(mul(a, inv(a)) == 1))
+            }
+        T = self.cayley_table("mul")
+        elems = np.arange(1, self.order)
+        sub = T[1:, 1:]
+        # 去掉 0 之後乘積不會出現 0，也不會超出範圍
+        closure = self._in_range(sub, 1)
         results = {
-            "closure": all(a * b in self.mul_elements for a in self.mul_elements for b in self.mul_elements),
-            "associativity": all((a * b) * c == a * (b * c)
-                                 for a in self.mul_elements for b in self.mul_elements for c in self.mul_elements),
-            "identity": all(a * self.element(1) == a for a in self.mul_elements),
-            # 修正：真正檢查逆元存在
-            "inverse": all(
-                any(a * b == self.element(1) for b in self.mul_elements)
-                for a in self.mul_elements
-            )
+            "closure": closure,
+            "associativity": closure and self._check_associativity(T, elems),
+            "identity": bool(np.array_equal(sub[:, 0], elems)),
+            "inverse": self._check_inverse(T, elems, "inv", 1)
         }
         return results
 
-    def test_distributive_law(self):
+    def test_distributive_law(self, samples=None, seed=None):
+        exhaustive, samples = self._exhaustive(samples)
+        if not exhaustive:
+            add, mul = self._vectorize("add", 2), self._vectorize("mul", 2)
+            a, b, c = self._sample(0, samples, seed)
+            return bool(np.all(mul(a, add(b, c)) == add(mul(a, b), mul(a, c))))
         # 修正：a 必須遍歷所有元素（含 0）
+        A = self.cayley_table("add")
+        M = self.cayley_table("mul")
+        if not (self._in_range(A) and self._in_range(M)):
+            return False
         return all(
-            a * (b + c) == a * b + a * c 
-            for a in self.add_elements   # ← 關鍵修正！
-            for b in self.add_elements 
-            for c in self.add_elements
+            np.array_equal(M[a, A], A[np.ix_(M[a], M[a])])
+            for a in range(self.order)
         )
 
 
+# ====== GF(p) 上的多項式 (係數由低次到高次的 list) ======
+def _poly_trim(a):
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def _poly_sub(a, b, p):
+    n = max(len(a), len(b))
+    a = a + [0] * (n - len(a))
+    b = b + [0] * (n - len(b))
+    return _poly_trim([(x - y) % p for x, y in zip(a, b)])
+
+
+def _poly_mul(a, b, p):
+    if not a or not b:
+        return []
+    r = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                r[i + j] = (r[i + j] + x * y) % p
+    return _poly_trim(r)
+
+
+def _poly_mod(a, m, p):
+    a = _poly_trim(list(a))
+    inv_lead = pow(m[-1], -1, p)
+    while len(a) >= len(m):
+        coef = a[-1] * inv_lead % p
+        shift = len(a) - len(m)
+        for i, y in enumerate(m):
+            a[shift + i] = (a[shift + i] - coef * y) % p
+        _poly_trim(a)
+    return a
+
+
+def _poly_gcd(a, b, p):
+    while b:
+        a, b = b, _poly_mod(a, b, p)
+    return a
+
+
+def _poly_powmod(a, e, m, p):
+    result = [1]
+    while e:
+        if e & 1:
+            result = _poly_mod(_poly_mul(result, a, p), m, p)
+        a = _poly_mod(_poly_mul(a, a, p), m, p)
+        e >>= 1
+    return result
+
+
+def is_irreducible(f, p):
+    """Rabin 判別法: k 次多項式 f 不可約 <=> 對 i = 1..k/2，gcd(x^(p^i) - x, f) = 1"""
+    k = len(f) - 1
+    x = [0, 1]
+    h = x
+    for _ in range(k // 2):
+        h = _poly_powmod(h, p, f, p)
+        if len(_poly_gcd(f, _poly_sub(h, x, p), p)) > 1:
+            return False
+    return True
+
+
+def find_irreducible(p, k):
+    """依係數的 p 進位大小找出第一個首一的 k 次不可約多項式 (p=2, k=8 時就是 AES 的 0x11B)"""
+    for tail in range(1, p ** k):
+        f = [(tail // p ** i) % p for i in range(k)] + [1]
+        if f[0] != 0 and is_irreducible(f, p):
+            return f
+    raise ValueError(f"找不到 {k} 次不可約多項式")
+
+
+class GF(FiniteField):
+    """
+    擴張體 GF(p^k)
+    元素是次數 < k 的多項式，係數以 p 進位打包成整數 (p=2 時每個位元就是一個係數)；
+    整數運算元也視為打包後的多項式。元素個數 <= TABLE_LIMIT 時預設使用對數表。
+    """
+    def __init__(self, p, k, modulus=None, use_tables=True):
+        if not is_prime(p):
+            raise ValueError(f"{p} 不是質數，無法建構 GF(p^k)")
+        if k < 1:
+            raise ValueError("k 必須 >= 1")
+        self.p = p
+        self.k = k
+        self.order = p ** k
+        if modulus is None:
+            modulus = find_irreducible(p, k)
+        elif isinstance(modulus, int):
+            modulus = [(modulus // p ** i) % p for i in range(k + 1)]
+        self.modulus = list(modulus)
+        if len(self.modulus) != k + 1 or self.modulus[-1] != 1 or not is_irreducible(self.modulus, p):
+            raise ValueError("模多項式必須是首一的 k 次不可約多項式")
+        self._modulus_packed = self._pack(self.modulus)
+        self.name = f"GF({p}^{k})"
+        self.prime_field = False
+        self.key = (p, self.order, tuple(self.modulus))
+        self._setup(use_tables)
+
+    def _pack(self, coeffs):
+        return sum(c * self.p ** i for i, c in enumerate(coeffs))
+
+    def _unpack(self, v):
+        coeffs = []
+        for _ in range(self.k):
+            v, c = divmod(v, self.p)
+            coeffs.append(c)
+        return coeffs
+
+    def _find_generator(self):
+        q = self.order
+        if q == 2:
+            return 1
+        factors = prime_factors(q - 1)
+        for g in range(2, q):
+            if all(self._pow_raw(g, (q - 1) // r) != 1 for r in factors):
+                return g
+        raise ValueError(f"{self.name} 找不到生成元")
+
+    # ====== 加減: 係數各自模 p 相加 (p=2 時就是 XOR) ======
+    # 整數運算元先模 order (與 mul 相同)，超出範圍或負數的整數也落在 0..order-1
+    def add(self, a, b):
+        a %= self.order
+        b %= self.order
+        if self.p == 2:
+            return a ^ b
+        return self._pack([(x + y) % self.p for x, y in zip(self._unpack(a), self._unpack(b))])
+
+    def sub(self, a, b):
+        a %= self.order
+        b %= self.order
+        if self.p == 2:
+            return a ^ b
+        return self._pack([(x - y) % self.p for x, y in zip(self._unpack(a), self._unpack(b))])
+
+    def neg(self, a):
+        a %= self.order
+        if self.p == 2:
+            return a
+        return self._pack([-x % self.p for x in self._unpack(a)])
+
+    # ====== 乘法: 多項式相乘後模掉不可約多項式 ======
+    def _mul_raw(self, a, b):
+        if self.p == 2:
+            # 無進位乘法 (carry-less)，每次左移後立即約簡
+            top = 1 << self.k
+            r = 0
+            while b:
+                if b & 1:
+                    r ^= a
+                b >>= 1
+                a <<= 1
+                if a & top:
+                    a ^= self._modulus_packed
+            return r
+        product = _poly_mul(self._unpack(a), self._unpack(b), self.p)
+        return self._pack(_poly_mod(product, self.modulus, self.p))
+
+    def mul(self, a, b):
+        # 多項式乘法很慢，有表時查對數表
+        a %= self.order
+        b %= self.order
+        if not self.use_tables:
+            return self._mul_raw(a, b)
+        if a == 0 or b == 0:
+            return 0
+        return self.exp_table[self.log_table[a] + self.log_table[b]]
+
+    def _pow_raw(self, a, e):
+        if e < 0:
+            a, e = self._inv_raw(a), -e
+        result = 1
+        while e:
+            if e & 1:
+                result = self._mul_raw(result, a)
+            a = self._mul_raw(a, a)
+            e >>= 1
+        return result
+
+    def _inv_raw(self, a):
+        return self._pow_raw(a, self.order - 2)  # a^(q-1) = 1
+
+    # ====== 向量化 (凱萊表與抽樣檢測用) ======
+    def _vectorize(self, op, nargs):
+        # p=2 的加減就是 XOR；有表時乘法查對數表，都能直接作用在整數陣列上
+        if self.p == 2 and op in ("add", "sub", "neg"):
+            return getattr(self, op)
+        if op == "mul" and self.use_tables:
+            return self._mul_array
+        return super()._vectorize(op, nargs)
+
+    def _mul_array(self, a, b):
+        exp = np.asarray(self.exp_table)
+        log = np.asarray(self.log_table)
+        a, b = np.broadcast_arrays(np.asarray(a, dtype=np.int64) % self.order,
+                                   np.asarray(b, dtype=np.int64) % self.order)
+        return np.where((a == 0) | (b == 0), 0, exp[log[a] + log[b]])
+
+    def array(self, data):
+        """
+        GF(p^k) 的陣列: 元素為 GFElement 的 object ndarray
+        逐元素的 + - * / 與 @ 都由 NumPy 交給 GFElement 計算 (Python 層級的速度)；
+        GFArray 的取模運算只適用於質數體
+        """
+        to_element = np.frompyfunc(lambda x: GFElement(int(x), self), 1, 1)
+        return np.asarray(to_element(np.asarray(data, dtype=object)), dtype=object)
+
+
+def _check_same_field(a, b):
+    # 比較 field.key 而非 p: GF(7) 與 GF(7^2) 的 p 相同，但不是同一個體
+    if a.key != b.key:
+        raise ValueError("不同的有限體不能一起運算")
+
+
+class GFArray:
+    """GF(p) 向量/矩陣，以整數 ndarray 儲存，所有運算都在陣列上做完再取模"""
+    def __init__(self, data, field: 'FiniteField'):
+        if not field.prime_field:
+            raise ValueError("GFArray 只支援質數體 GF(p)，GF(p^k) 請用 field.array()")
+        self.field = field
+        p = field.p
+        # p^2 放得進 int64 就用 int64，否則退回 Python 整數 (object)
+        self.dtype = np.int64 if (p - 1) ** 2 <= np.iinfo(np.int64).max else object
+        if isinstance(data, GFArray):
+            _check_same_field(data.field, field)
+            arr = data.data
+        elif isinstance(data, np.ndarray) and data.dtype.kind in "iu":
+            arr = data
+        else:
+            # 可能混有 GFElement 或超出 int64 的整數，先逐一轉成 Python int 取模
+            def to_int(x):
+                if isinstance(x, GFElement):
+                    _check_same_field(x.field, field)
+                return int(x) % p
+            arr = np.vectorize(to_int, otypes=[object])(np.asarray(data, dtype=object))
+        self.data = np.asarray(arr % p).astype(self.dtype)
+
+    @property
+    def p(self):
+        return self.field.p
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"GFArray(p={self.p}, {self.data.tolist()})"
+
+    def tolist(self):
+        return self.data.tolist()
+
+    def __getitem__(self, key):
+        value = self.data[key]
+        if isinstance(value, np.ndarray):
+            return GFArray(value, self.field)
+        return GFElement(int(value), self.field)
+
+    def __setitem__(self, key, value):
+        self.data[key] = self._other(value)
+
+    def _other(self, other):
+        """把另一個運算元轉成 ndarray (或純量) 並取模"""
+        if isinstance(other, GFArray):
+            _check_same_field(other.field, self.field)
+            return other.data
+        if isinstance(other, GFElement):
+            _check_same_field(other.field, self.field)
+            return other.value
+        if isinstance(other, int):
+            return other % self.p
+        return GFArray(other, self.field).data
+
+    # ====== 逐元素運算 ======
+    def __add__(self, other):
+        return GFArray((self.data + self._other(other)) % self.p, self.field)
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return GFArray((self.data - self._other(other)) % self.p, self.field)
+
+    def __rsub__(self, other):
+        return GFArray((self._other(other) - self.data) % self.p, self.field)
+
+    def __mul__(self, other):
+        return GFArray(self.data * self._other(other) % self.p, self.field)
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return GFArray(-self.data % self.p, self.field)
+
+    def __truediv__(self, other):
+        other = self._other(other)
+        if isinstance(other, np.ndarray):
+            return self * GFArray(other, self.field).inverse_elements()
+        return self * self.field.inv(other)
+
+    def __rtruediv__(self, other):
+        return self.inverse_elements() * self._other(other)
+
+    def __pow__(self, e):
+        return GFArray(_pow_array(self.data, e, self.p), self.field)
+
+    def __eq__(self, other):
+        return np.array_equal(self.data, np.broadcast_to(self._other(other), self.shape))
+
+    def inverse_elements(self):
+        """逐元素乘法反元素"""
+        if np.any(self.data == 0):
+            raise ZeroDivisionError("division by zero in finite field")
+        if self.field.use_tables:
+            return GFArray(np.asarray(self.field.inv_table)[self.data], self.field)
+        return GFArray(_pow_array(self.data, self.p - 2, self.p), self.field)  # 費馬小定理
+
+    # ====== 內積與矩陣乘法 ======
+    def __matmul__(self, other):
+        B = self._other(other)
+        A = self.data
+        if self.dtype is object:
+            result = A.dot(B) % self.p
+        # 每次只累加 chunk 個乘積，確保總和不會超出 int64
+        else:
+            chunk = max(1, np.iinfo(np.int64).max // max((self.p - 1) ** 2, 1))
+            result = None
+            for start in range(0, A.shape[-1], chunk):
+                part = np.matmul(A[..., start:start + chunk], B[start:start + chunk]) % self.p
+                result = part if result is None else (result + part) % self.p
+        if np.ndim(result) == 0:
+            return GFElement(int(result), self.field)  # 兩個向量的內積是一個元素
+        return GFArray(result, self.field)
+
+    def dot(self, other):
+        return self @ other
+
+    # ====== 高斯消去法 ======
+    def rref(self):
+        """列簡化梯形矩陣，輸出 (rref 矩陣, 樞紐欄位 list)"""
+        M = self.data.copy()
+        rows, cols = M.shape
+        pivots = []
+        r = 0
+        for c in range(cols):
+            if r == rows:
+                break
+            nonzero = np.flatnonzero(M[r:, c])
+            if len(nonzero) == 0:
+                continue
+            k = r + nonzero[0]
+            M[[r, k]] = M[[k, r]]
+            M[r] = M[r] * self.field.inv(int(M[r, c])) % self.p
+            # 一次消去其他所有列的第 c 欄
+            factor = M[:, c].copy()
+            factor[r] = 0
+            M = (M - np.outer(factor, M[r]) % self.p) % self.p
+            pivots.append(c)
+            r += 1
+        return GFArray(M, self.field), pivots
+
+    def rank(self):
+        return len(self.rref()[1])
+
+    def inv(self):
+        """方陣的反矩陣"""
+        n, m = self.shape
+        if n != m:
+            raise ValueError("只有方陣才有反矩陣")
+        augmented = np.concatenate([self.data, np.eye(n, dtype=self.dtype)], axis=1)
+        R, pivots = GFArray(augmented, self.field).rref()
+        if pivots[:n] != list(range(n)):
+            raise ZeroDivisionError("矩陣不可逆")
+        return R[:, n:]
+
+
+def _pow_array(a, e, p):
+    """逐元素快速冪 a^e mod p (e 為非負整數)"""
+    if e < 0:
+        raise ValueError("請先取反元素再做負次方")
+    result = np.ones_like(a)
+    base = a % p
+    while e:
+        if e & 1:
+            result = result * base % p
+        base = base * base % p
+        e >>= 1
+    return result
+
+
 # ==========================
 #       示範程式
 # ==========================
@@ -171,6 +943,29 @@ if __name__ == "__main__":
         print(f"a + b * c = {a + b * c}")
         print(f"(a + b) * c = {(a + b) * c}")
         print(f"-a = {-a}")
+        print(f"a ** 3 = {a ** 3}")
+
+        print("\n--- GFArray 矩陣運算 ---")
+        A = F.array([[a_val, b_val], [c_val, 1]])
+        print(f"A = {A}")
+        print(f"A @ A = {A @ A}")
+        print(f"rank(A) = {A.rank()}")
+        if A.rank() == 2:
+            print(f"A^-1 = {A.inv()}")
+            print(f"A @ A^-1 = {A @ A.inv()}")
+
+        print("\n--- 擴張體 GF(2^8) ---")
+        F256 = GF(2, 8)
+        x, y = F256.element(0x53), F256.element(0xCA)
+        print(f"模多項式 = {hex(F256._modulus_packed)}")
+        print(f"{x} * {y} = {x * y}")
+        print(f"{x} + {y} = {x + y}")
+        print(f"1 / {x} = {1 / x}")
+        M = F256.array([[0x53, 1], [2, 0xCA]])
+        print(f"M @ M = {(M @ M).tolist()}")
+        # 太大無法窮舉的擴張體用抽樣檢測
+        F32 = GF(2, 32)
+        print(f"{F32.name} 乘法群 (抽樣 1000 組):", F32.test_mul_group(samples=1000, seed=0))
 
     except ValueError as e:
         print("錯誤:", e)
@@ -1,12 +1,28 @@
+import time
 import tkinter as tk
-import math
 from tkinter import ttk 
+from 仿射變換 import TransformablePolygon
+
+FPS = 60             # 畫布每秒最多重繪的次數
+HOLD_DELAY_MS = 400  # 按住按鈕多久之後開始連續變換
 
 class TransformableTriangleApp:
-    def __init__(self, master):
+    """
+    只負責顯示與按鈕的 Tk 介面；頂點與變換都在 TransformablePolygon (仿射變換.py) 裡，
+    不開視窗時可以直接使用該模型 (見 效能測試.py)
+    """
+    def __init__(self, master, points=None, model=None, fps=FPS):
         self.master = master
         master.title("藍色三角形變換器")
 
+        # --- 重繪排程 ---
+        # 變換只改模型，畫布最多每一幀 (1/fps 秒) 更新一次，期間的變換合併成一次重繪
+        self.frame_ms = max(1, round(1000 / fps))
+        self._redraw_job = None
+        self._last_redraw = 0.0
+        self._hold_job = None
+        self._hold_repeated = False
+
         # --- 設定畫布 ---
         self.canvas_width = 500
         self.canvas_height = 500
@@ -14,15 +30,15 @@ class TransformableTriangleApp:
         self.canvas.pack(pady=10, padx=10)
         
         # --- 初始三角形設定 ---
-        # 初始頂點座標 (以元組 (x, y) 形式儲存)
-        p1 = (250, 100)
-        p2 = (100, 350)
-        p3 = (400, 350)
-        
-        # 原始座標用於重置
-        self.original_points = [p1, p2, p3]
-        # 當前座標用於變換
-        self.current_points = list(self.original_points)
+        # 初始頂點座標 (以元組 (x, y) 形式儲存)；也可以傳入任意多邊形的頂點
+        if points is None:
+            p1 = (250, 100)
+            p2 = (100, 350)
+            p3 = (400, 350)
+            points = [p1, p2, p3]
+
+        # 原始座標保存在 shape 裡 (唯讀)，變換只累積成一個 3x3 矩陣
+        self.shape = model if model is not None else TransformablePolygon(points)
         
         # 繪製初始三角形，並取得它的 ID
         self.triangle_id = self._draw_triangle()
@@ -33,32 +49,41 @@ class TransformableTriangleApp:
         # 初始計算幾何中心 (用於旋轉和縮放)
         self._recalculate_center()
 
+    @property
+    def original_points(self):
+        return self.shape.original_points
+
+    @property
+    def current_points(self):
+        return self.shape.points
+
     def _setup_controls(self):
         """建立並放置控制按鈕"""
         frame = ttk.Frame(self.master)
         frame.pack(pady=10)
 
-        # 旋轉按鈕
-        ttk.Button(frame, text="🔄 旋轉 (15°)", command=self.rotate_triangle).pack(side=tk.LEFT, padx=5)
-        
-        # 縮放按鈕
-        ttk.Button(frame, text="🔍 縮放 (x 1.2)", command=self.scale_triangle).pack(side=tk.LEFT, padx=5)
-        
-        # 平移按鈕
-        ttk.Button(frame, text="➡️ 平移 (右/下 20)", command=self.translate_triangle).pack(side=tk.LEFT, padx=5)
+        # 旋轉、縮放、平移按鈕: 按一下 (或用鍵盤觸發) 變換一次，由 command 執行；
+        # 滑鼠按住超過 HOLD_DELAY_MS 則每一幀重複一次，按下/放開只負責開始與停止重複
+        for text, action in (("🔄 旋轉 (15°)", self.rotate_triangle),
+                             ("🔍 縮放 (x 1.2)", self.scale_triangle),
+                             ("➡️ 平移 (右/下 20)", self.translate_triangle)):
+            button = ttk.Button(frame, text=text, command=lambda action=action: self._click(action))
+            button.pack(side=tk.LEFT, padx=5)
+            button.bind("<ButtonPress-1>", lambda event, action=action: self._start_hold(action))
+            button.bind("<ButtonRelease-1>", lambda event: self._stop_hold())
+            button.bind("<Leave>", lambda event: self._leave_hold())
         
         # 重設按鈕
         ttk.Button(frame, text="⟲ 重設", command=self.reset_triangle).pack(side=tk.LEFT, padx=15)
 
     def _get_coords_flat(self):
         """將 [(x1, y1), (x2, y2), ...] 轉換成 [x1, y1, x2, y2, ...]"""
-        return [c for p in self.current_points for c in p]
+        return self.current_points.ravel().tolist()
 
     def _recalculate_center(self):
         """計算並更新當前三角形的幾何中心點 (用於變換基準)"""
-        num_points = len(self.current_points)
-        self.center_x = sum(p[0] for p in self.current_points) / num_points
-        self.center_y = sum(p[1] for p in self.current_points) / num_points
+        # 仿射變換保持頂點平均值，中心由累積矩陣直接算出，不必走訪所有頂點
+        self.center_x, self.center_y = self.shape.center
 
     def _draw_triangle(self):
         """首次繪製三角形"""
@@ -71,7 +96,20 @@ class TransformableTriangleApp:
         )
 
     def _update_triangle(self):
+        """
+        要求重繪: 若這一幀已經排定重繪就什麼都不做 (合併)，
+        否則用 master.after 排在距離上次重繪滿一幀的時間點
+        """
+        if self._redraw_job is not None:
+            return
+        elapsed_ms = (time.perf_counter() - self._last_redraw) * 1000
+        delay = max(0, round(self.frame_ms - elapsed_ms))
+        self._redraw_job = self.master.after(delay, self._redraw)
+
+    def _redraw(self):
         """用新的座標更新畫布上的三角形"""
+        self._redraw_job = None
+        self._last_redraw = time.perf_counter()
         # 獲取新的扁平座標列表
         coords = self._get_coords_flat()
         
@@ -80,68 +118,65 @@ class TransformableTriangleApp:
         # 注意：我們使用 *coords 將列表解包成單獨的參數
         
         self._recalculate_center() # 每次變換後更新中心點   
+
+    # --- 按住連續變換 ---
+    def _click(self, action):
+        """按鈕的 command (滑鼠放開或鍵盤觸發)；這次按住已經連續變換過就不再多做一次"""
+        if self._hold_repeated:
+            self._hold_repeated = False
+            return
+        action()
+
+    def _start_hold(self, action):
+        """按下時只排定連續變換，單次的變換留給放開時的 command"""
+        self._stop_hold()
+        self._hold_repeated = False
+        self._hold_job = self.master.after(HOLD_DELAY_MS, self._repeat_hold, action)
+
+    def _repeat_hold(self, action):
+        self._hold_repeated = True
+        action()
+        self._hold_job = self.master.after(self.frame_ms, self._repeat_hold, action)
+
+    def _stop_hold(self):
+        if self._hold_job is not None:
+            self.master.after_cancel(self._hold_job)
+            self._hold_job = None
+
+    def _leave_hold(self):
+        # 移出按鈕後放開不會觸發 command，清掉標記以免下一次 (例如鍵盤) 被略過
+        self._stop_hold()
+        self._hold_repeated = False
+
+    def apply_commands(self, commands):
+        """一次套用大量指令 (例如腳本)，只會觸發一次重繪"""
+        self.shape.run(commands)
+        self._update_triangle()
+
     # --- 1. 平移 (Translation) ---
     def translate_triangle(self, dx=20, dy=20):
         """將三角形向右和向下平移指定的距離"""
-        new_points = []
-        for x, y in self.current_points:
-            new_points.append((x + dx, y + dy))
-            
-        self.current_points = new_points
+        self.shape.translate(dx, dy)
         self._update_triangle()
 
 
     # --- 2. 縮放 (Scaling) ---
     def scale_triangle(self, factor=1.2):
         """以幾何中心點為基準，縮放三角形"""
-        cx, cy = self.center_x, self.center_y
-        new_points = []
-        
-        for x, y in self.current_points:
-            # 1. 移至原點, 2. 縮放, 3. 移回中心
-            new_x = cx + factor * (x - cx)
-            new_y = cy + factor * (y - cy)
-            new_points.append((new_x, new_y))
-            
-        self.current_points = new_points
+        self.shape.scale(factor)
         self._update_triangle()
 
 
     # --- 3. 旋轉 (Rotation) ---
     def rotate_triangle(self, angle_deg=15):
         """以幾何中心點為基準，順時針旋轉指定的角度"""
-        
-        angle_rad = math.radians(angle_deg)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        cx, cy = self.center_x, self.center_y
-        new_points = []
-
-        for x, y in self.current_points:
-            # 相對於中心點的座標
-            x_rel = x - cx
-            y_rel = y - cy
-            
-            # 執行旋轉公式 (二維旋轉)
-            # x' = x_rel * cos(a) - y_rel * sin(a)
-            # y' = x_rel * sin(a) + y_rel * cos(a)
-            rotated_x_rel = x_rel * cos_a - y_rel * sin_a
-            rotated_y_rel = x_rel * sin_a + y_rel * cos_a
-            
-            # 移回中心點的位置
-            new_x = rotated_x_rel + cx
-            new_y = rotated_y_rel + cy
-            new_points.append((new_x, new_y))
-
-        self.current_points = new_points
+        self.shape.rotate(angle_deg)
         self._update_triangle()
 
     # --- 重設 ---
     def reset_triangle(self):
-        """將三角形恢復到初始狀態"""
-        # 複製原始座標列表
-        self.current_points = list(self.original_points)
+        """將三角形恢復到初始狀態 (累積矩陣設回單位矩陣)"""
+        self.shape.reset()
         self._update_triangle()
 
 # --- 啟動應用程式 ---
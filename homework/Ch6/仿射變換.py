@@ -0,0 +1,217 @@
+import math
+import numpy as np
+
+# ====== 1. 齊次座標的 3x3 仿射矩陣 ======
+# 點 (x, y) 寫成 (x, y, 1)，平移、縮放、旋轉都變成矩陣乘法，
+# 連續的變換只要把矩陣相乘就能合成一個矩陣。
+
+def translation(dx, dy):
+    """平移矩陣"""
+    return np.array([[1.0, 0.0, dx],
+                     [0.0, 1.0, dy],
+                     [0.0, 0.0, 1.0]])
+
+def scaling(sx, sy=None, cx=0.0, cy=0.0):
+    """以 (cx, cy) 為基準的縮放矩陣 (sy 省略時等比例縮放)"""
+    if sy is None:
+        sy = sx
+    return np.array([[sx, 0.0, cx - sx * cx],
+                     [0.0, sy, cy - sy * cy],
+                     [0.0, 0.0, 1.0]])
+
+def rotation(angle_deg, cx=0.0, cy=0.0):
+    """
+    以 (cx, cy) 為基準的旋轉矩陣
+    x' = x cos(a) - y sin(a), y' = x sin(a) + y cos(a)
+    畫布的 y 軸向下，所以角度為正時在螢幕上是順時針
+    """
+    a = math.radians(angle_deg)
+    c, s = math.cos(a), math.sin(a)
+    return np.array([[c, -s, cx - c * cx + s * cy],
+                     [s, c, cy - s * cx - c * cy],
+                     [0.0, 0.0, 1.0]])
+
+def apply(matrix, points):
+    """把仿射矩陣一次套用到 N x 2 的頂點陣列"""
+    points = np.asarray(points, dtype=float)
+    return points @ matrix[:2, :2].T + matrix[:2, 2]
+
+
+# ====== 2. 可變換的多邊形 ======
+class TransformablePolygon:
+    """
+    保存原始頂點 (唯讀) 與一個累積的變換矩陣。
+    每次平移/縮放/旋轉只把新矩陣乘到累積矩陣上 (O(1))，
+    真正的頂點座標等到讀取 points 時才用一次矩陣乘法算出來。
+    累積矩陣的前兩列以 6 個 Python 浮點數保存 (第三列固定是 0 0 1)，
+    每個指令只是幾次純量運算，不必為 3x3 的小矩陣付出 NumPy 的呼叫成本。
+    """
+    def __init__(self, points):
+        self.original_points = np.array(points, dtype=float).reshape(-1, 2)
+        self.original_points.flags.writeable = False
+        # 仿射變換會保持頂點平均值，所以中心點只要變換原始中心即可
+        self._original_center = tuple(self.original_points.mean(axis=0).tolist())
+        self.reset()
+
+    def __len__(self):
+        return len(self.original_points)
+
+    def reset(self):
+        """回到初始狀態: 只需把累積矩陣設回單位矩陣"""
+        self._m = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+        self._points = self.original_points
+
+    @property
+    def matrix(self):
+        """目前的累積變換 (3x3 齊次矩陣)"""
+        a, b, c, d, e, f = self._m
+        return np.array([[a, b, c], [d, e, f], [0.0, 0.0, 1.0]])
+
+    def _compose(self, a2, b2, c2, d2, e2, f2):
+        """左乘 [[a2 b2 c2] [d2 e2 f2] [0 0 1]]"""
+        a, b, c, d, e, f = self._m
+        self._m = (a2 * a + b2 * d, a2 * b + b2 * e, a2 * c + b2 * f + c2,
+                   d2 * a + e2 * d, d2 * b + e2 * e, d2 * c + e2 * f + f2)
+        self._points = None
+
+    def transform(self, matrix):
+        """在目前的狀態之後再接一個變換 (新的矩陣乘在左邊)"""
+        (a, b, c), (d, e, f) = np.asarray(matrix, dtype=float)[:2].tolist()
+        self._compose(a, b, c, d, e, f)
+
+    def _center_xy(self):
+        a, b, c, d, e, f = self._m
+        x, y = self._original_center
+        return a * x + b * y + c, d * x + e * y + f
+
+    @property
+    def center(self):
+        """目前的幾何中心 (頂點平均值)"""
+        return np.array(self._center_xy())
+
+    @property
+    def points(self):
+        """目前的頂點座標 (N x 2)，需要時才計算並快取"""
+        if self._points is None:
+            a, b, c, d, e, f = self._m
+            self._points = self.original_points @ np.array([[a, d], [b, e]]) + (c, f)
+            self._points.flags.writeable = False
+        return self._points
+
+    # 以下三個變換與 translation / scaling / rotation 相同，只是直接展開成純量運算
+    # --- 1. 平移 (Translation) ---
+    def translate(self, dx, dy):
+        self._compose(1.0, 0.0, dx, 0.0, 1.0, dy)
+
+    # --- 2. 縮放 (Scaling)，以目前的中心為基準 ---
+    def scale(self, factor):
+        cx, cy = self._center_xy()
+        self._compose(factor, 0.0, cx - factor * cx, 0.0, factor, cy - factor * cy)
+
+    # --- 3. 旋轉 (Rotation)，以目前的中心為基準 ---
+    def rotate(self, angle_deg):
+        cx, cy = self._center_xy()
+        a = math.radians(angle_deg)
+        c, s = math.cos(a), math.sin(a)
+        self._compose(c, -s, cx - c * cx + s * cy, s, c, cy - s * cx - c * cy)
+
+    def run(self, commands):
+        """依序執行一串指令，例如 [("rotate", 15), ("scale", 1.2), ("translate", 20, 20)]"""
+        for name, *args in commands:
+            if name not in ("translate", "scale", "rotate", "reset"):
+                raise ValueError(f"未知的指令: {name}")
+            getattr(self, name)(*args)
+
+
+# ====== 3. 不需要視窗的繪製 ======
+RASTER_CELLS = 1 << 22  # 每批 (掃描線數 x 邊數) 的上限，頂點很多時自動減少每批的列數
+
+def rasterize(points, width=500, height=500, out=None):
+    """
+    掃描線填滿多邊形 (奇偶規則)，像素中心在多邊形內的設為 1
+    輸入: points N x 2 頂點, width/height 影像大小, out 可重複使用的 uint8 緩衝區
+    輸出: height x width 的 uint8 陣列
+    """
+    points = np.asarray(points, dtype=float)
+    if out is None:
+        out = np.zeros((height, width), dtype=np.uint8)
+    else:
+        out[:] = 0
+    x0, y0 = points[:, 0], points[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    # 只有跨過某條掃描線的邊才需要考慮 (水平邊不會與掃描線相交)
+    lo, hi = np.minimum(y0, y1), np.maximum(y0, y1)
+    row_lo = max(int(np.ceil(lo.min() - 0.5)), 0)
+    row_hi = min(int(np.ceil(hi.max() - 0.5)), height)
+    inv_slope = np.divide(x1 - x0, y1 - y0, out=np.zeros_like(x0), where=y1 != y0)
+
+    chunk = min(max(1, RASTER_CELLS // len(points)), 64)
+    for start in range(row_lo, row_hi, chunk):
+        rows = np.arange(start, min(start + chunk, row_hi))
+        # 這一批掃描線只需要 y 範圍有重疊的邊
+        e = np.flatnonzero((lo < rows[-1] + 1) & (hi > rows[0]))
+        yc = rows[:, None] + 0.5
+        crossing = (lo[e] <= yc) & (yc < hi[e])
+        xs = np.where(crossing, x0[e] + (yc - y0[e]) * inv_slope[e], np.inf)
+        xs.sort(axis=1)
+        # 每條掃描線的交點兩兩成對，對 [left, right) 之間的像素做差分再累加
+        k = crossing.sum(axis=1).max()
+        left = np.clip(np.ceil(xs[:, 0:k:2] - 0.5), 0, width).astype(np.int64)
+        right = np.clip(np.ceil(xs[:, 1:k:2] - 0.5), 0, width).astype(np.int64)
+        diff = np.zeros((len(rows), width + 1), dtype=np.int32)
+        r = np.broadcast_to(np.arange(len(rows))[:, None], left.shape)
+        valid = np.isfinite(xs[:, 1:k:2])
+        np.add.at(diff, (r[valid], left[valid]), 1)
+        np.add.at(diff, (r[valid], right[valid]), -1)
+        out[rows] = np.cumsum(diff[:, :width], axis=1) > 0
+    return out
+
+def to_svg(points, width=500, height=500, fill="blue", outline="darkblue"):
+    """把多邊形輸出成 SVG 字串"""
+    coords = " ".join(f"{x:.2f},{y:.2f}" for x, y in np.asarray(points, dtype=float))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+            f'<polygon points="{coords}" fill="{fill}" stroke="{outline}" stroke-width="2"/></svg>')
+
+
+def regular_polygon(n, cx=250.0, cy=250.0, r=150.0):
+    """正 n 邊形的頂點，方便測試大量頂點的情況"""
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.stack([cx + r * np.cos(t), cy + r * np.sin(t)], axis=1)
+
+
+# --- 範例測試 ---
+if __name__ == "__main__":
+    tri = TransformablePolygon([(250, 100), (100, 350), (400, 350)])
+    tri.rotate(15)
+    tri.scale(1.2)
+    tri.translate(20, 20)
+    print("變換後的三角形:\n", tri.points)
+    print("中心:", tri.center)
+
+    # 與逐點計算的結果比較
+    pts = [(250.0, 100.0), (100.0, 350.0), (400.0, 350.0)]
+    cx = sum(p[0] for p in pts) / 3
+    cy = sum(p[1] for p in pts) / 3
+    a = math.radians(15)
+    pts = [(cx + (x - cx) * math.cos(a) - (y - cy) * math.sin(a),
+            cy + (x - cx) * math.sin(a) + (y - cy) * math.cos(a)) for x, y in pts]
+    pts = [(cx + 1.2 * (x - cx), cy + 1.2 * (y - cy)) for x, y in pts]
+    pts = [(x + 20, y + 20) for x, y in pts]
+    print("與逐點計算的最大差異:", np.abs(tri.points - np.array(pts)).max())
+
+    tri.reset()
+    print("重設後:", tri.points.tolist())
+
+    # 大量頂點的多邊形: 1000 次變換只是 1000 次 3x3 矩陣乘法，最後才算一次頂點
+    poly = TransformablePolygon(regular_polygon(100000))
+    for _ in range(1000):
+        poly.rotate(1)
+        poly.scale(1.0001)
+        poly.translate(0.01, 0)
+    print(f"{len(poly)} 個頂點，中心: {poly.center}, 第一個頂點: {poly.points[0]}")
+
+    # 不開視窗也能畫出來
+    tri.run([("rotate", 15), ("scale", 1.2), ("translate", 20, 20)])
+    image = rasterize(tri.points)
+    print(f"點陣圖 {image.shape}, 填滿 {int(image.sum())} 個像素 (三角形面積約 {37500 * 1.44:.0f})")
+    print(to_svg(tri.points)[:80], "...")
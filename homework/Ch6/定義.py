@@ -1,4 +1,7 @@
 import math
+from fractions import Fraction
+from enum import IntEnum
+import numpy as np
 
 # 設定浮點數比較容忍度，防止因浮點數誤差導致判斷錯誤
 EPSILON = 1e-9
@@ -41,10 +44,65 @@ class Circle: # 定義圓，使用 (x-h)^2 + (y-k)^2 = r^2
     def __repr__(self):
         return f"Circle(Center={self.center}, Radius={self.radius:.3f})"
 
+# --- 穩健判斷 (filtered predicates) ---
+# 先用浮點數算出判斷式的值，同時估計捨入誤差的上界；
+# 只有 |值| 落在誤差範圍內 (符號不確定) 時，才用 Fraction 重新精確計算。
+# 輸入可以是純量或陣列，輸出為 -1 / 0 / 1 的 int8 陣列。
+ROUNDOFF = 2.0 ** -53
+predicate_stats = {"fast": 0, "exact": 0}
+
+def _filtered_sign(value, errbound, exact):
+    sign = np.sign(value).astype(np.int8)
+    ambiguous = np.flatnonzero(np.abs(value) <= errbound)
+    for i in ambiguous:
+        v = exact(i)
+        sign[i] = (v > 0) - (v < 0)
+    predicate_stats["fast"] += len(sign) - len(ambiguous)
+    predicate_stats["exact"] += len(ambiguous)
+    return sign
+
+def det2_sign(a, b, c, d):
+    """a*d - b*c 的符號"""
+    a, b, c, d = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (a, b, c, d))
+    ad, bc = a * d, b * c
+    errbound = (3 + 16 * ROUNDOFF) * ROUNDOFF * (np.abs(ad) + np.abs(bc))
+    return _filtered_sign(ad - bc, errbound,
+                          lambda i: Fraction(a[i]) * Fraction(d[i]) - Fraction(b[i]) * Fraction(c[i]))
+
+def circle_circle_signs(x1, y1, r1, x2, y2, r2):
+    """
+    兩圓的位置關係，用距離平方比較避免開根號
+    outer = sign(d^2 - (r1+r2)^2): > 0 外離, = 0 外切
+    inner = sign(d^2 - (r1-r2)^2): < 0 內含, = 0 內切
+    """
+    x1, y1, r1, x2, y2, r2 = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (x1, y1, r1, x2, y2, r2))
+    d2 = (x2 - x1)**2 + (y2 - y1)**2
+    s2, t2 = (r1 + r2)**2, (r1 - r2)**2
+
+    def exact_d2(i):
+        return (Fraction(x2[i]) - Fraction(x1[i]))**2 + (Fraction(y2[i]) - Fraction(y1[i]))**2
+
+    outer = _filtered_sign(d2 - s2, 8 * ROUNDOFF * (d2 + s2),
+                           lambda i: exact_d2(i) - (Fraction(r1[i]) + Fraction(r2[i]))**2)
+    inner = _filtered_sign(d2 - t2, 8 * ROUNDOFF * (d2 + s2),
+                           lambda i: exact_d2(i) - (Fraction(r1[i]) - Fraction(r2[i]))**2)
+    return outer, inner
+
+def line_circle_sign(A, B, C, cx, cy, r):
+    """sign(C'^2 - r^2 (A^2+B^2))，C' = C + A*cx + B*cy: > 0 不相交, = 0 相切, < 0 交於兩點"""
+    A, B, C, cx, cy, r = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (A, B, C, cx, cy, r))
+    c_prime = C + A * cx + B * cy
+    rhs = r**2 * (A**2 + B**2)
+    magnitude = (np.abs(C) + np.abs(A * cx) + np.abs(B * cy))**2 + rhs
+    return _filtered_sign(c_prime**2 - rhs, 12 * ROUNDOFF * magnitude,
+                          lambda i: (Fraction(C[i]) + Fraction(A[i]) * Fraction(cx[i]) + Fraction(B[i]) * Fraction(cy[i]))**2
+                          - Fraction(r[i])**2 * (Fraction(A[i])**2 + Fraction(B[i])**2))
+
 # --- 幾何計算函式 ---
+# robust=True 時，分類 (平行、相切...) 改用上面的穩健判斷，不再依賴 EPSILON
 
 # 1. 計算兩直線交點 (Intersection of two Lines)
-def intersect_two_lines(l1: Line, l2: Line):
+def intersect_two_lines(l1: Line, l2: Line, robust=False):
     """
     計算兩直線 l1 和 l2 的交點。
     使用克拉瑪法則 解二元一次聯立方程式。
@@ -54,8 +112,13 @@ def intersect_two_lines(l1: Line, l2: Line):
     # A2*x + B2*y = -C2
     
     D = l1.A * l2.B - l2.A * l1.B # 行列式 D
-    
-    if abs(D) < EPSILON:
+
+    if robust:
+        if det2_sign(l1.A, l2.A, l1.B, l2.B)[0] == 0:
+            if det2_sign(l1.A, l2.A, l1.C, l2.C)[0] == 0 and det2_sign(l1.B, l2.B, l1.C, l2.C)[0] == 0:
+                return "重合 (Coincident)", None
+            return "平行 (Parallel)", None
+    elif abs(D) < EPSILON:
         # D 接近 0，表示兩直線平行或重合
         if abs(l1.A * l2.C - l2.A * l1.C) < EPSILON and abs(l1.B * l2.C - l2.B * l1.C) < EPSILON:
              return "重合 (Coincident)", None # 重合
@@ -71,25 +134,36 @@ def intersect_two_lines(l1: Line, l2: Line):
     return "交於一點", Point(x, y)
 
 # 2. 計算兩圓交點 (Intersection of two Circles)
-def intersect_two_circles(c1: Circle, c2: Circle):
+def intersect_two_circles(c1: Circle, c2: Circle, robust=False):
     """計算兩圓 c1 和 c2 的交點。"""
     
     d = c1.center.distance_to(c2.center)
     r1, r2 = c1.radius, c2.radius
     
     # 距離判斷
-    if d > r1 + r2 + EPSILON:
-        return "不相交 (External)", []
-    if d < abs(r1 - r2) - EPSILON:
-        # 內含或同心圓
-        return "內含/同心 (Contained)", []
-    if abs(d) < EPSILON and abs(r1 - r2) < EPSILON:
-        return "重合 (Coincident)", []
+    if robust:
+        outer, inner = circle_circle_signs(c1.center.x, c1.center.y, r1, c2.center.x, c2.center.y, r2)
+        if outer[0] > 0:
+            return "不相交 (External)", []
+        if inner[0] < 0:
+            return "內含/同心 (Contained)", []
+        if c1.center.x == c2.center.x and c1.center.y == c2.center.y and r1 == r2:
+            return "重合 (Coincident)", []
+        tangent = outer[0] == 0 or inner[0] == 0
+    else:
+        if d > r1 + r2 + EPSILON:
+            return "不相交 (External)", []
+        if d < abs(r1 - r2) - EPSILON:
+            # 內含或同心圓
+            return "內含/同心 (Contained)", []
+        if abs(d) < EPSILON and abs(r1 - r2) < EPSILON:
+            return "重合 (Coincident)", []
+        tangent = abs(d - (r1 + r2)) <= EPSILON or abs(d - abs(r1 - r2)) <= EPSILON
     
     # 計算交點
     # a = (r1^2 - r2^2 + d^2) / (2d)
     a = (r1**2 - r2**2 + d**2) / (2 * d)
-    h = math.sqrt(abs(r1**2 - a**2)) # h 是交點弦到圓心的距離
+    h = 0.0 if tangent else math.sqrt(abs(r1**2 - a**2)) # h 是交點弦到圓心的距離
     
     # 找出交點弦直線與兩圓心連線的交點 P2
     # P2 位於 P1 到 P2 距離為 a 的位置
@@ -110,7 +184,7 @@ def intersect_two_circles(c1: Circle, c2: Circle):
     intersections.append(Point(p_x1, p_y1))
 
     # 第二個交點 (除非相切，否則存在)
-    if abs(d - (r1 + r2)) > EPSILON and abs(d - abs(r1 - r2)) > EPSILON:
+    if not tangent:
         p_x2 = p2.x - h * dy
         p_y2 = p2.y + h * dx
         intersections.append(Point(p_x2, p_y2))
@@ -119,7 +193,7 @@ def intersect_two_circles(c1: Circle, c2: Circle):
     return "相切 (Tangent)", intersections # 恰好相切
 
 # 3. 計算直線與圓交點 (Intersection of Line and Circle)
-def intersect_line_circle(l: Line, c: Circle):
+def intersect_line_circle(l: Line, c: Circle, robust=False):
     """計算直線 l 和圓 c 的交點。"""
     
     cx, cy = c.center.x, c.center.y
@@ -132,9 +206,16 @@ def intersect_line_circle(l: Line, c: Circle):
     
     # 計算圓心到直線的距離 d
     d = abs(C_prime) / math.sqrt(A**2 + B**2)
-    
-    if d > r + EPSILON:
-        return "不相交", [] # 距離大於半徑
+
+    if robust:
+        sign = line_circle_sign(A, B, C, cx, cy, r)[0]
+        if sign > 0:
+            return "不相交", []
+        tangent = sign == 0
+    else:
+        if d > r + EPSILON:
+            return "不相交", [] # 距離大於半徑
+        tangent = abs(d - r) < EPSILON
     
     # 找出垂足 P0 的座標 (最近點)
     # x0 = -A * C' / (A^2 + B^2)
@@ -149,15 +230,15 @@ def intersect_line_circle(l: Line, c: Circle):
     
     intersections = []
     
-    if abs(d - r) < EPSILON:
+    if tangent:
         # 相切 (距離等於半徑)
         intersections.append(Point(x0, y0))
         return "相切", intersections
         
     # 相交於兩點
-    if d < r - EPSILON:
+    if robust or d < r - EPSILON:
         # L 是半弦長 (半弦長L^2 + d^2 = r^2)
-        L = math.sqrt(r**2 - d**2)
+        L = math.sqrt(max(r**2 - d**2, 0.0))
         
         # 找出直線方向單位向量的兩個分量
         # 垂直於 (A, B)，因此方向向量為 (B, -A) 或 (-B, A)
@@ -258,6 +339,387 @@ def verify_pythagorean_theorem(l: Line, p_out: Point):
         return False
 
 
+# 6. 結構陣列 (Structure of Arrays): 一次存放大量的點、直線、圓
+class Intersection(IntEnum):
+    """交點狀態碼，取代中文狀態字串，方便在陣列中比較"""
+    NONE = 0        # 不相交 (含外離)
+    ONE = 1         # 兩直線交於一點
+    TWO = 2         # 交於兩點
+    TANGENT = 3     # 相切
+    PARALLEL = 4    # 平行
+    COINCIDENT = 5  # 重合
+    CONTAINED = 6   # 內含/同心
+
+class PointArray:
+    """N 個點，x 與 y 各為一條連續的 float64 陣列"""
+    def __init__(self, x, y):
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+
+    @classmethod
+    def from_points(cls, points):
+        return cls([p.x for p in points], [p.y for p in points])
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, idx):
+        if np.ndim(idx) == 0 and not isinstance(idx, slice):
+            return Point(self.x[idx], self.y[idx])
+        return PointArray(self.x[idx], self.y[idx])
+
+    def __repr__(self):
+        return f"PointArray(n={len(self)})"
+
+    def to_points(self):
+        return [Point(x, y) for x, y in zip(self.x, self.y)]
+
+    def distance_to(self, other):
+        """逐點距離；other 可以是 PointArray 或單一 Point"""
+        return np.hypot(self.x - other.x, self.y - other.y)
+
+class LineArray:
+    """N 條直線 A*x + B*y + C = 0，係數各為一條 float64 陣列"""
+    def __init__(self, A, B, C):
+        self.A = np.ascontiguousarray(A, dtype=np.float64)
+        self.B = np.ascontiguousarray(B, dtype=np.float64)
+        self.C = np.ascontiguousarray(C, dtype=np.float64)
+
+    @classmethod
+    def from_lines(cls, lines):
+        return cls([l.A for l in lines], [l.B for l in lines], [l.C for l in lines])
+
+    @classmethod
+    def from_points(cls, p1: PointArray, p2: PointArray):
+        # 與 Line.from_points 相同的公式，逐列計算
+        return cls(p2.y - p1.y, p1.x - p2.x, p2.x * p1.y - p1.x * p2.y)
+
+    def __len__(self):
+        return len(self.A)
+
+    def __getitem__(self, idx):
+        if np.ndim(idx) == 0 and not isinstance(idx, slice):
+            return Line(self.A[idx], self.B[idx], self.C[idx])
+        return LineArray(self.A[idx], self.B[idx], self.C[idx])
+
+    def __repr__(self):
+        return f"LineArray(n={len(self)})"
+
+    def to_lines(self):
+        return [Line(A, B, C) for A, B, C in zip(self.A, self.B, self.C)]
+
+class CircleArray:
+    """N 個圓，圓心座標與半徑各為一條 float64 陣列"""
+    def __init__(self, cx, cy, r):
+        self.cx = np.ascontiguousarray(cx, dtype=np.float64)
+        self.cy = np.ascontiguousarray(cy, dtype=np.float64)
+        self.r = np.ascontiguousarray(r, dtype=np.float64)
+
+    @classmethod
+    def from_circles(cls, circles):
+        return cls([c.center.x for c in circles], [c.center.y for c in circles], [c.radius for c in circles])
+
+    @property
+    def center(self):
+        return PointArray(self.cx, self.cy)
+
+    def __len__(self):
+        return len(self.r)
+
+    def __getitem__(self, idx):
+        if np.ndim(idx) == 0 and not isinstance(idx, slice):
+            return Circle(Point(self.cx[idx], self.cy[idx]), self.r[idx])
+        return CircleArray(self.cx[idx], self.cy[idx], self.r[idx])
+
+    def __repr__(self):
+        return f"CircleArray(n={len(self)})"
+
+    def to_circles(self):
+        return [Circle(Point(x, y), r) for x, y, r in zip(self.cx, self.cy, self.r)]
+
+def _as_line_array(lines):
+    return lines if isinstance(lines, LineArray) else LineArray.from_lines(lines)
+
+def _as_circle_array(circles):
+    return circles if isinstance(circles, CircleArray) else CircleArray.from_circles(circles)
+
+# --- 逐列計算的幾何核心 (輸入等長陣列，第 k 列對第 k 列) ---
+def perpendicular_lines_from_points(l: LineArray, p_out: PointArray):
+    """perpendicular_line_from_point 的陣列版"""
+    return LineArray(l.B, -l.A, l.A * p_out.y - l.B * p_out.x)
+
+def intersect_two_lines_array(l1: LineArray, l2: LineArray, robust=False):
+    """
+    intersect_two_lines 的陣列版
+    輸出: (codes, points)，codes 為 Intersection 狀態碼，不是 ONE 的列交點為 nan
+    """
+    D = l1.A * l2.B - l2.A * l1.B
+    if robust:
+        parallel = det2_sign(l1.A, l2.A, l1.B, l2.B) == 0
+        coincident = parallel.copy()
+        k = np.flatnonzero(parallel)
+        coincident[k] = ((det2_sign(l1.A[k], l2.A[k], l1.C[k], l2.C[k]) == 0)
+                         & (det2_sign(l1.B[k], l2.B[k], l1.C[k], l2.C[k]) == 0))
+    else:
+        parallel = np.abs(D) < EPSILON
+        coincident = (parallel & (np.abs(l1.A * l2.C - l2.A * l1.C) < EPSILON)
+                      & (np.abs(l1.B * l2.C - l2.B * l1.C) < EPSILON))
+    codes = np.where(coincident, Intersection.COINCIDENT,
+                     np.where(parallel, Intersection.PARALLEL, Intersection.ONE))
+    safe_D = np.where(parallel, 1.0, D)
+    x = np.where(parallel, np.nan, (-l1.C * l2.B + l2.C * l1.B) / safe_D)
+    y = np.where(parallel, np.nan, (-l1.A * l2.C + l2.A * l1.C) / safe_D)
+    return codes, PointArray(x, y)
+
+def intersect_two_circles_array(c1: CircleArray, c2: CircleArray, robust=False):
+    """
+    intersect_two_circles 的陣列版
+    輸出: (codes, p1, p2)，沒有交點的位置為 nan，相切時 p2 為 nan
+    """
+    dx = c2.cx - c1.cx
+    dy = c2.cy - c1.cy
+    d = np.hypot(dx, dy)
+    r1, r2 = c1.r, c2.r
+
+    if robust:
+        outer, inner = circle_circle_signs(c1.cx, c1.cy, r1, c2.cx, c2.cy, r2)
+        external = outer > 0
+        contained = ~external & (inner < 0)
+        coincident = ~external & ~contained & (dx == 0) & (dy == 0) & (r1 == r2)
+        hit = ~(external | contained | coincident)
+        tangent = hit & ((outer == 0) | (inner == 0))
+    else:
+        external = d > r1 + r2 + EPSILON
+        contained = ~external & (d < np.abs(r1 - r2) - EPSILON)
+        coincident = ~external & ~contained & (d < EPSILON) & (np.abs(r1 - r2) < EPSILON)
+        hit = ~(external | contained | coincident)
+        tangent = hit & ((np.abs(d - (r1 + r2)) <= EPSILON) | (np.abs(d - np.abs(r1 - r2)) <= EPSILON))
+
+    codes = np.full(len(d), Intersection.TWO, dtype=np.int8)
+    codes[external] = Intersection.NONE
+    codes[contained] = Intersection.CONTAINED
+    codes[coincident] = Intersection.COINCIDENT
+    codes[tangent] = Intersection.TANGENT
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        safe_d = np.where(hit, d, 1.0)
+        a = (r1**2 - r2**2 + d**2) / (2 * safe_d)
+        h = np.where(tangent, 0.0, np.sqrt(np.abs(r1**2 - a**2)))
+        ux, uy = dx / safe_d, dy / safe_d
+    x0 = c1.cx + a * ux
+    y0 = c1.cy + a * uy
+    p1 = PointArray(np.where(hit, x0 + h * uy, np.nan), np.where(hit, y0 - h * ux, np.nan))
+    two = hit & ~tangent
+    p2 = PointArray(np.where(two, x0 - h * uy, np.nan), np.where(two, y0 + h * ux, np.nan))
+    return codes, p1, p2
+
+def intersect_line_circle_array(l: LineArray, c: CircleArray, robust=False):
+    """
+    intersect_line_circle 的陣列版
+    輸出: (codes, p1, p2)，沒有交點的位置為 nan，相切時 p2 為 nan
+    """
+    norm2 = l.A**2 + l.B**2
+    norm = np.sqrt(norm2)
+    c_prime = l.C + l.A * c.cx + l.B * c.cy
+    d = np.abs(c_prime) / norm
+
+    if robust:
+        sign = line_circle_sign(l.A, l.B, l.C, c.cx, c.cy, c.r)
+        hit = sign <= 0
+        tangent = sign == 0
+    else:
+        hit = d <= c.r + EPSILON
+        tangent = hit & (np.abs(d - c.r) < EPSILON)
+    codes = np.where(tangent, Intersection.TANGENT,
+                     np.where(hit, Intersection.TWO, Intersection.NONE)).astype(np.int8)
+
+    # 垂足與半弦長
+    x0 = c.cx - l.A * c_prime / norm2
+    y0 = c.cy - l.B * c_prime / norm2
+    L = np.where(tangent, 0.0, np.sqrt(np.maximum(c.r**2 - d**2, 0.0)))
+    p1 = PointArray(np.where(hit, x0 + L * l.B / norm, np.nan), np.where(hit, y0 - L * l.A / norm, np.nan))
+    two = hit & ~tangent
+    p2 = PointArray(np.where(two, x0 - L * l.B / norm, np.nan), np.where(two, y0 + L * l.A / norm, np.nan))
+    return codes, p1, p2
+
+
+def verify_pythagorean_theorem_batch(lines, points, tol=EPSILON):
+    """
+    verify_pythagorean_theorem 的批次版: 第 k 條直線配第 k 個線外點，一次向量化驗證。
+    殘差為 |d1^2 + d2^2 - d3^2|，超過 tol * max(1, d3^2) 視為失敗 (相對誤差，座標很大時也適用)。
+    輸出: dict
+        residual      : 每一組的殘差
+        max_residual  : 最大殘差
+        mean_residual : 平均殘差
+        failed        : 失敗的索引 (含 A=B=0 的無效直線)
+    """
+    lines = _as_line_array(lines)
+    points = points if isinstance(points, PointArray) else PointArray.from_points(points)
+
+    # 垂足 H: 原直線與垂直線的交點
+    codes, h = intersect_two_lines_array(lines, perpendicular_lines_from_points(lines, points))
+
+    # 直線上任取一點 P_on，規則同單筆版本
+    use_x_axis = np.abs(lines.A) > EPSILON
+    valid = use_x_axis | (np.abs(lines.B) > EPSILON)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p_on = PointArray(np.where(use_x_axis, -lines.C / lines.A, 0.0),
+                          np.where(use_x_axis, 0.0, -lines.C / lines.B))
+
+    # 直接算距離平方，不必開根號再平方
+    d1_sq = (points.x - h.x)**2 + (points.y - h.y)**2
+    d2_sq = (h.x - p_on.x)**2 + (h.y - p_on.y)**2
+    d3_sq = (points.x - p_on.x)**2 + (points.y - p_on.y)**2
+    residual = np.abs(d1_sq + d2_sq - d3_sq)
+
+    ok = valid & (codes == Intersection.ONE) & (residual <= tol * np.maximum(1.0, d3_sq))
+    checked = residual[valid & (codes == Intersection.ONE)]
+    return {
+        "residual": residual,
+        "max_residual": float(checked.max()) if len(checked) else 0.0,
+        "mean_residual": float(checked.mean()) if len(checked) else 0.0,
+        "failed": np.flatnonzero(~ok),
+    }
+
+
+# 7. 大量圖形的交點 (所有配對)
+# 單一圖形在網格中最多登記的格數，超過的另外處理
+GRID_MAX_CELLS = 64
+
+def _grid_candidate_pairs(xmin, ymin, xmax, ymax, cell, max_cells=GRID_MAX_CELLS):
+    """
+    均勻網格索引: 把每個外接矩形登記到它覆蓋的所有格子，
+    只有落在同一格的圖形才成為候選配對。回傳 (i, j)，i < j 且不重複
+    覆蓋超過 max_cells 格的大圖形不登記 (否則一個大圓就要展開成上百萬格)，
+    改成直接與所有圖形比對外接矩形，每個大圖形只多一次 O(n) 的向量化比較
+    """
+    n = len(xmin)
+    # 先用浮點數算格數，極大的半徑只會變成 inf (歸為大圖形)，不會溢位
+    fx0, fy0 = np.floor(xmin / cell), np.floor(ymin / cell)
+    with np.errstate(over="ignore"):
+        cells = (np.floor(xmax / cell) - fx0 + 1) * (np.floor(ymax / cell) - fy0 + 1)
+    large = np.flatnonzero(~(cells <= max_cells))
+    small = np.flatnonzero(cells <= max_cells)
+
+    big_i, big_j = [], []
+    for s in large:
+        overlap = np.flatnonzero((xmin <= xmax[s]) & (xmax >= xmin[s]) & (ymin <= ymax[s]) & (ymax >= ymin[s]))
+        overlap = overlap[overlap != s]
+        big_i.append(np.full(len(overlap), s))
+        big_j.append(overlap)
+
+    ix0 = fx0[small].astype(np.int64)
+    iy0 = fy0[small].astype(np.int64)
+    nx = np.floor(xmax[small] / cell).astype(np.int64) - ix0 + 1
+    ny = np.floor(ymax[small] / cell).astype(np.int64) - iy0 + 1
+
+    # 展開成 (圖形, 格子) 的登記表
+    per_shape = nx * ny
+    local = np.repeat(np.arange(len(small)), per_shape)
+    k = np.arange(len(local)) - np.repeat(np.cumsum(per_shape) - per_shape, per_shape)
+    gx = ix0[local] + k % nx[local]
+    gy = iy0[local] + k // nx[local]
+    shape_id = small[local]
+
+    # 依格子排序，同一格的登記會連在一起
+    order = np.lexsort((shape_id, gy, gx))
+    gx, gy, shape_id = gx[order], gy[order], shape_id[order]
+    new_group = np.ones(len(gx), dtype=bool)
+    new_group[1:] = (gx[1:] != gx[:-1]) | (gy[1:] != gy[:-1])
+    group_end = np.append(np.flatnonzero(new_group)[1:], len(gx))
+    end = group_end[np.cumsum(new_group) - 1]
+
+    # 第 t 筆登記與同一格中排在它後面的每一筆配對
+    counts = end - np.arange(len(gx)) - 1
+    first = np.repeat(np.arange(len(gx)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    i = np.concatenate([shape_id[first]] + big_i).astype(np.int64)
+    j = np.concatenate([shape_id[first + 1 + offset]] + big_j).astype(np.int64)
+
+    # 同一對可能同時出現在好幾格 (或兩個都是大圖形)，去掉重複
+    keys = np.unique(np.minimum(i, j) * n + np.maximum(i, j))
+    return keys // n, keys % n
+
+def _pack_points(p1, p2):
+    """兩個 PointArray 疊成 K x 2 x 2 的陣列"""
+    return np.stack([np.stack([p1.x, p1.y], axis=1), np.stack([p2.x, p2.y], axis=1)], axis=1)
+
+def intersect_circles_bulk(circles, cell_size=None, robust=False):
+    """
+    找出一組圓之間所有的交點 (circles 可以是 Circle 的 list 或 CircleArray)。
+    先用網格索引篩掉外接矩形不重疊的配對，剩下的再一次向量化計算。
+    輸出: (pairs, points, codes)
+        pairs  : K x 2，有交點的兩圓索引
+        points : K x 2 x 2，交點座標 (相切時第二點為 nan)
+        codes  : K，Intersection.TWO 或 Intersection.TANGENT
+    """
+    circles = _as_circle_array(circles)
+    if len(circles) < 2:
+        return np.empty((0, 2), dtype=np.int64), np.empty((0, 2, 2)), np.empty(0, dtype=np.int8)
+    cx, cy, r = circles.cx, circles.cy, circles.r
+    if cell_size is None:
+        cell_size = 2 * max(float(np.median(r)), EPSILON)
+    i, j = _grid_candidate_pairs(cx - r, cy - r, cx + r, cy + r, cell_size)
+
+    codes, p1, p2 = intersect_two_circles_array(circles[i], circles[j], robust)
+    hit = (codes == Intersection.TWO) | (codes == Intersection.TANGENT)
+    return np.stack([i[hit], j[hit]], axis=1), _pack_points(p1[hit], p2[hit]), codes[hit]
+
+def intersect_lines_circles_bulk(lines, circles, chunk=1024, robust=False):
+    """
+    所有直線與所有圓的交點。直線沒有有限的外接矩形，所以改成分塊向量化:
+    每次拿 chunk 條直線對全部圓算距離，只有距離 <= 半徑的配對才計算交點。
+    輸出: (pairs, points, codes)，pairs 的每列為 (直線索引, 圓索引)
+    """
+    lines = _as_line_array(lines)
+    circles = _as_circle_array(circles)
+    pair_list, point_list, code_list = [], [], []
+    for start in range(0, len(lines), chunk):
+        A, B, C = (v[start:start + chunk, None] for v in (lines.A, lines.B, lines.C))
+        norm = np.sqrt(A**2 + B**2)
+        A_cx, B_cy = A * circles.cx, B * circles.cy
+        d = np.abs(C + A_cx + B_cy) / norm
+        if robust:
+            # 與 line_circle_sign 相同的前向誤差上界: 距離落在誤差範圍內的配對都交給核心精確判斷
+            slack = 12 * ROUNDOFF * ((np.abs(C) + np.abs(A_cx) + np.abs(B_cy)) / norm + circles.r)
+        else:
+            slack = EPSILON
+        li, ci = np.nonzero(d <= circles.r + slack)
+        li += start
+        codes, p1, p2 = intersect_line_circle_array(lines[li], circles[ci], robust)
+        if robust:
+            hit = codes != Intersection.NONE
+            li, ci, codes, p1, p2 = li[hit], ci[hit], codes[hit], p1[hit], p2[hit]
+        pair_list.append(np.stack([li, ci], axis=1))
+        point_list.append(_pack_points(p1, p2))
+        code_list.append(codes)
+    if not pair_list:
+        return np.empty((0, 2), dtype=np.int64), np.empty((0, 2, 2)), np.empty(0, dtype=np.int8)
+    return np.concatenate(pair_list), np.concatenate(point_list), np.concatenate(code_list)
+
+def intersect_lines_bulk(lines, chunk=1024, robust=False):
+    """
+    所有直線兩兩之間的交點 (平行、重合的配對不輸出)。
+    任兩條不平行的直線必相交，輸出量本來就是 O(N^2)，這裡只做分塊向量化。
+    輸出: (pairs, points)，points 為 K x 2
+    """
+    lines = _as_line_array(lines)
+    pair_list, point_list = [], []
+    for start in range(0, len(lines), chunk):
+        rows = np.arange(start, min(start + chunk, len(lines)))
+        li = np.repeat(rows, len(lines))
+        lj = np.tile(np.arange(len(lines)), len(rows))
+        keep = lj > li  # 每對只算一次
+        li, lj = li[keep], lj[keep]
+        codes, p = intersect_two_lines_array(lines[li], lines[lj], robust)
+        one = codes == Intersection.ONE
+        pair_list.append(np.stack([li[one], lj[one]], axis=1))
+        point_list.append(np.stack([p.x[one], p.y[one]], axis=1))
+    if not pair_list:
+        return np.empty((0, 2), dtype=np.int64), np.empty((0, 2))
+    return np.concatenate(pair_list), np.concatenate(point_list)
+
+
 # --- 範例測試 ---
 if __name__ == "__main__":
     
@@ -333,4 +795,58 @@ if __name__ == "__main__":
     P_out_pyth = Point(5, 1)
     verify_pythagorean_theorem(L_pyth, P_out_pyth) 
     # 預期結果: 垂足 H (3, 3)。P_outH = sqrt(8)。P_on (0, 0)。HP_on = sqrt(18)。P_outP_on = sqrt(26)。
-    # 8 + 18 = 26 (驗證成功)
\ No newline at end of file
+    # 8 + 18 = 26 (驗證成功)
+
+    ## 6. 結構陣列
+    print("\n================== 6. 結構陣列 ==================")
+    starts = PointArray([1, 0, 0], [1, 0, 5])
+    ends = PointArray([3, 1, 1], [5, 1, 5])
+    lines = LineArray.from_points(starts, ends)
+    print(f"直線: {lines.to_lines()}")
+    print(f"端點距離: {starts.distance_to(ends)}")
+    circles = CircleArray.from_circles([C_1, C_2, C_1])
+    codes, p1, p2 = intersect_line_circle_array(lines, circles)
+    print(f"直線與圓狀態碼: {[Intersection(c).name for c in codes]}")
+
+    ## 7. 大量圖形的交點
+    print("\n================== 7. 批次交點 ==================")
+    pairs, points, codes = intersect_circles_bulk([C_1, C_2, C_3_intersect])
+    print(f"圓與圓: 配對 {pairs.tolist()}, 狀態 {[Intersection(c).name for c in codes]}")
+    pairs, points, codes = intersect_lines_circles_bulk([L_5, L_6], [C_1])
+    print(f"直線與圓: 配對 {pairs.tolist()}, 狀態 {[Intersection(c).name for c in codes]}")
+    pairs, points = intersect_lines_bulk([L_1, L_2, L_3_parallel])
+    print(f"直線與直線: 配對 {pairs.tolist()}, 交點 {points.tolist()}")
+
+    ## 8. 批次驗證畢氏定理
+    print("\n================== 8. 批次驗證畢氏定理 ==================")
+    rng = np.random.default_rng(0)
+    n = 100000
+    batch_lines = LineArray(rng.normal(size=n), rng.normal(size=n), rng.normal(size=n) * 10)
+    batch_points = PointArray(rng.uniform(-100, 100, n), rng.uniform(-100, 100, n))
+    result = verify_pythagorean_theorem_batch(batch_lines, batch_points)
+    print(f"{n} 組: 最大殘差 {result['max_residual']:.3e}, 平均殘差 {result['mean_residual']:.3e}, 失敗 {len(result['failed'])} 組")
+
+    ## 9. 穩健判斷 (robust=True)
+    print("\n================== 9. 穩健判斷 ==================")
+    # 幾乎平行但其實相交於原點: 固定 EPSILON 會誤判為平行
+    L_near = Line(1, 1 + 1e-12, 0)
+    print(f"L: {Line(1, 1, 0)} 與 {L_near}")
+    print(f" -> EPSILON: {intersect_two_lines(Line(1, 1, 0), L_near)[0]}")
+    print(f" -> robust : {intersect_two_lines(Line(1, 1, 0), L_near, robust=True)}")
+    # 尺度很小的兩圓其實外離，固定 EPSILON 會當成相交
+    tiny_1, tiny_2 = Circle(Point(0, 0), 1e-10), Circle(Point(3e-10, 0), 1e-10)
+    print(f"微小圓 {tiny_1} 與 {tiny_2}")
+    print(f" -> EPSILON: {intersect_two_circles(tiny_1, tiny_2)[0]}")
+    print(f" -> robust : {intersect_two_circles(tiny_1, tiny_2, robust=True)[0]}")
+    # 3-4-5 直角三角形頂點上的相切直線與圓，精確判斷為相切
+    print(f"直線 {Line(3, 4, -25)} 與圓 {C_1}: {intersect_line_circle(Line(3, 4, -25), C_1, robust=True)}")
+
+    # 整數座標的隨機圓，含不少剛好相切的配對
+    m = 100000
+    circles_a = CircleArray(rng.integers(-20, 20, m), rng.integers(-20, 20, m), rng.integers(1, 20, m))
+    circles_b = CircleArray(rng.integers(-20, 20, m), rng.integers(-20, 20, m), rng.integers(1, 20, m))
+    predicate_stats.update(fast=0, exact=0)
+    robust_codes, _, _ = intersect_two_circles_array(circles_a, circles_b, robust=True)
+    fast_codes, _, _ = intersect_two_circles_array(circles_a, circles_b)
+    print(f"{len(circles_a)} 組圓: 分類不同 {np.count_nonzero(robust_codes != fast_codes)} 組, "
+          f"浮點快速判斷 {predicate_stats['fast']} 次, 精確重算 {predicate_stats['exact']} 次")
@@ -0,0 +1,104 @@
+import math
+import time
+import numpy as np
+from 仿射變換 import TransformablePolygon, rasterize, to_svg, regular_polygon
+
+# 不需要視窗: 重播一長串旋轉/縮放/平移指令，量測變換速度與每次重繪的延遲
+
+def random_commands(n, seed=0):
+    """產生 n 個隨機指令 (與按鈕相同的三種變換)"""
+    rng = np.random.default_rng(seed)
+    kinds = rng.integers(0, 3, n)
+    values = rng.uniform(-1, 1, (n, 2))
+    commands = []
+    for k, (u, v) in zip(kinds, values):
+        if k == 0:
+            commands.append(("rotate", 15 * u))
+        elif k == 1:
+            commands.append(("scale", 1 + 0.05 * u))
+        else:
+            commands.append(("translate", 20 * u, 20 * v))
+    return commands
+
+def _naive_run(points, commands):
+    """原本 TransformableTriangleApp 的做法: 每個指令都走訪所有頂點並重算中心，作為比較基準"""
+    points = [tuple(p) for p in points]
+    for name, *args in commands:
+        cx = sum(p[0] for p in points) / len(points)
+        cy = sum(p[1] for p in points) / len(points)
+        if name == "translate":
+            dx, dy = args
+            points = [(x + dx, y + dy) for x, y in points]
+        elif name == "scale":
+            f = args[0]
+            points = [(cx + f * (x - cx), cy + f * (y - cy)) for x, y in points]
+        else:
+            a = math.radians(args[0])
+            c, s = math.cos(a), math.sin(a)
+            points = [(cx + (x - cx) * c - (y - cy) * s, cy + (x - cx) * s + (y - cy) * c) for x, y in points]
+    return np.array(points)
+
+def benchmark(points, commands, frame_every=100, renderer="raster", width=500, height=500):
+    """
+    重播指令，每 frame_every 個指令重繪一次
+    輸入: points 初始頂點, commands 指令串, renderer 為 "raster"、"svg" 或 None (只算頂點)
+    輸出: dict，transforms_per_sec 變換速度、latency_ms 每次重繪延遲 (中位數/p95/最大)、frames 重繪次數
+    """
+    if renderer not in ("raster", "svg", None):
+        raise ValueError(f"未知的繪製方式: {renderer}")
+    shape = TransformablePolygon(points)
+    buffer = np.zeros((height, width), dtype=np.uint8)
+    latencies = []
+    transform_time = 0.0
+    for start in range(0, len(commands), frame_every):
+        t0 = time.perf_counter()
+        shape.run(commands[start:start + frame_every])
+        t1 = time.perf_counter()
+        # 重繪 = 算出頂點 + 繪製
+        pts = shape.points
+        if renderer == "raster":
+            rasterize(pts, width, height, out=buffer)
+        elif renderer == "svg":
+            to_svg(pts, width, height)
+        t2 = time.perf_counter()
+        transform_time += t1 - t0
+        latencies.append(t2 - t1)
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "shape": shape,
+        "transforms_per_sec": len(commands) / transform_time,
+        "latency_ms": {"median": float(np.median(latencies)),
+                       "p95": float(np.percentile(latencies, 95)),
+                       "max": float(latencies.max())},
+        "frames": len(latencies),
+    }
+
+
+# --- 範例測試 ---
+if __name__ == "__main__":
+    commands = random_commands(100000)
+    triangle = [(250, 100), (100, 350), (400, 350)]
+
+    ## 1. 與逐點計算比較正確性與速度
+    print("================== 1. 正確性與基準比較 ==================")
+    for n_vertices in (3, 1000):
+        points = triangle if n_vertices == 3 else regular_polygon(n_vertices)
+        sub = commands[:10000]
+        t = time.perf_counter()
+        expected = _naive_run(points, sub)
+        naive = len(sub) / (time.perf_counter() - t)
+        result = benchmark(points, sub, renderer=None)
+        err = np.abs(result["shape"].points - expected).max()
+        print(f"{n_vertices} 個頂點: 矩陣堆疊 {result['transforms_per_sec']:,.0f} 次/秒, "
+              f"逐點計算 {naive:,.0f} 次/秒, 最大差異 {err:.2e}")
+
+    ## 2. 重繪延遲
+    print("\n================== 2. 重繪延遲 ==================")
+    for n_vertices in (3, 10000):
+        points = triangle if n_vertices == 3 else regular_polygon(n_vertices)
+        for renderer in ("raster", "svg"):
+            result = benchmark(points, commands, frame_every=1000, renderer=renderer)
+            lat = result["latency_ms"]
+            print(f"{n_vertices:>6} 個頂點 {renderer:>6}: {result['transforms_per_sec']:,.0f} 次/秒, "
+                  f"{result['frames']} 幀, 延遲 中位數 {lat['median']:.3f} ms / p95 {lat['p95']:.3f} ms / 最大 {lat['max']:.3f} ms")
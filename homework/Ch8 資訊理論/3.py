@@ -1,4 +1,5 @@
 import numpy as np
+from 資訊度量 import entropy, cross_entropy, kl_divergence, mutual_information
 
 def calculate_information_metrics():
     # --- 準備數據 ---
@@ -8,22 +9,21 @@ def calculate_information_metrics():
     # Q: 預測分佈 (例如：模型預測這張照片是貓的機率)
     Q = np.array([0.6, 0.3, 0.1])
     
-    # 為了避免 log(0) 發生錯誤，我們加上一個極小值 epsilon
-    epsilon = 1e-10
+    # 機率為 0 的項由 資訊度量.py 的遮罩處理 (0 log 0 = 0)，不需要加 epsilon
 
     # --- 1. 熵 (Entropy) ---
     # 公式: H(P) = - Σ p(x) * log(p(x))
-    entropy = -np.sum(P * np.log2(P + epsilon))
+    h = entropy(P)
 
     # --- 2. 交叉熵 (Cross-Entropy) ---
     # 公式: H(P, Q) = - Σ p(x) * log(q(x))
     # 在機器學習中，這就是 Loss Function (損失函數)
-    cross_entropy = -np.sum(P * np.log2(Q + epsilon))
+    ce = cross_entropy(P, Q)
 
     # --- 3. KL 散度 (KL Divergence) ---
     # 公式: D_KL(P||Q) = Σ p(x) * log(p(x) / q(x))
     # 也可以寫成: 交叉熵 - 熵
-    kl_divergence = np.sum(P * np.log2((P / (Q + epsilon)) + epsilon))
+    kl = kl_divergence(P, Q)
 
     # --- 4. 互資訊 (Mutual Information) ---
     # 這裡需要一個聯合機率分佈矩陣 P(X,Y)
@@ -36,13 +36,10 @@ def calculate_information_metrics():
     P_y = np.sum(P_xy, axis=0) # Col sum -> [0.1, 0.9]
     
     # 公式: I(X;Y) = ΣΣ p(x,y) * log( p(x,y) / (p(x)p(y)) )
-    mi = 0
-    for i in range(len(P_x)):
-        for j in range(len(P_y)):
-            if P_xy[i, j] > 0: # 只計算非零項
-                mi += P_xy[i, j] * np.log2(P_xy[i, j] / (P_x[i] * P_y[j]))
+    # 向量化計算，p(x,y) = 0 的項自動略過
+    mi = mutual_information(P_xy)
 
-    return entropy, cross_entropy, kl_divergence, mi
+    return h, ce, kl, mi
 
 # 執行並輸出
 res_entropy, res_ce, res_kl, res_mi = calculate_information_metrics()
@@ -1,9 +1,5 @@
 import numpy as np
-
-def cross_entropy(P, Q):
-    # 避免 log(0) 錯誤
-    epsilon = 1e-15
-    return -np.sum(P * np.log2(Q + epsilon))
+from 資訊度量 import cross_entropy
 
 def verify_inequality():
     # 1. 設定真實分佈 P
@@ -40,7 +36,8 @@ def verify_inequality():
     print("-" * 75)
     
     # 3. 結論驗證
-    if self_entropy <= min([cross_entropy(P, np.random.dirichlet(np.ones(3))) for _ in range(100)]):
+    # 100 個隨機 Q 一次算完 (沿最後一軸)
+    if self_entropy <= cross_entropy(P, np.random.dirichlet(np.ones(3), size=100)).min():
         print("\n結論：驗證成功！")
         print("H(P, Q) (交叉熵) 永遠大於等於 H(P, P) (熵)。")
         print("也就是說：用錯誤的 Q 去預測 P，付出的代價(Bits)一定比用 P 自己預測要高。")
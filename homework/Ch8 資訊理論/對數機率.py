@@ -0,0 +1,166 @@
+import decimal
+import math
+import numpy as np
+
+# 在對數空間計算機率: 連乘變連加，0.5^10000 這種 10^-3011 的數也不會變成 0。
+# 一般用 float64 就夠了；只有需要更多有效數字 (或指數極大) 時才用 decimal 補算 (precise_power)。
+
+LOG10_E = 1 / math.log(10)
+
+# ====== 1. 基本運算 ======
+def logsumexp(a, axis=None, keepdims=False):
+    """
+    log(Σ exp(a))，先減去最大值避免 exp 溢位
+    全部是 -inf (機率全為 0) 時結果為 -inf
+    """
+    a = np.asarray(a, dtype=float)
+    m = np.max(a, axis=axis, keepdims=True)
+    m = np.where(np.isfinite(m), m, 0.0)
+    with np.errstate(divide="ignore"):
+        s = np.log(np.sum(np.exp(a - m), axis=axis, keepdims=True)) + m
+    return s if keepdims else np.squeeze(s, axis=axis)
+
+def log1mexp(x):
+    """
+    log(1 - exp(x))，x <= 0；也就是由 log p 算 log(1 - p)
+    x 接近 0 時用 log(-expm1(x))，x 很負時用 log1p(-exp(x))，兩邊都不會失去精度
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore"):
+        return np.where(x > -math.log(2), np.log(-np.expm1(x)), np.log1p(-np.exp(x)))
+
+def log_add(a, b):
+    """log(exp(a) + exp(b))，對應機率相加"""
+    return np.logaddexp(a, b)
+
+def log_sub(a, b):
+    """log(exp(a) - exp(b))，需要 a >= b，對應機率相減"""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    return a + log1mexp(b - a)
+
+def log_prob(p):
+    """機率轉成 log 機率，p = 0 得到 -inf"""
+    with np.errstate(divide="ignore"):
+        return np.log(np.asarray(p, dtype=float))
+
+# ====== 2. 獨立事件的連乘 ======
+def log_power(p, n):
+    """log(p^n) = n log p"""
+    return np.asarray(n) * log_prob(p)
+
+def log_bernoulli(p, k, n):
+    """
+    n 次獨立試驗中特定一串 (k 次成功、n-k 次失敗) 的 log 機率
+    log(p^k (1-p)^(n-k))，1-p 用 log1p(-p) 計算，p 很小時也準確
+    """
+    p = np.asarray(p, dtype=float)
+    k, n = np.asarray(k), np.asarray(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        success = np.where(k == 0, 0.0, k * log_prob(p))
+        failure = np.where(n == k, 0.0, (n - k) * np.log1p(-p))
+    return success + failure
+
+def sequence_log_likelihood(sequences, probs):
+    """
+    i.i.d. 類別序列的 log 似然
+    輸入: sequences 為 N x L 的符號索引 (0 ~ K-1), probs 為 K 個符號的機率
+    輸出: 長度 N 的 log 機率
+    """
+    logp = log_prob(probs)
+    return np.take(logp, np.asarray(sequences)).sum(axis=-1)
+
+def stream_log_likelihood(chunks, probs):
+    """
+    序列太長放不進記憶體時，按時間分段送進來: 每個 chunk 是 N x l 的符號索引
+    (所有序列的下一段)，逐段累加，輸出長度 N 的 log 機率
+    """
+    logp = log_prob(probs)
+    total = None
+    for chunk in chunks:
+        part = np.take(logp, np.asarray(chunk)).sum(axis=-1)
+        total = part if total is None else total + part
+    return total
+
+# ====== 3. 輸出 ======
+def to_scientific(log_p, digits=5):
+    """
+    把自然對數的機率寫成 a.bcde × 10^k 的字串
+    float 的 log 值有約 16 位有效數字，其中整數部分用掉 log10|k| 位，
+    所以 |k| 越大尾數越不準 (k ~ 10^3 時約 12 位，k ~ 10^11 時只剩 4 位)，此時改用 precise_power
+    """
+    if log_p == -math.inf:
+        return "0"
+    log10_p = log_p * LOG10_E
+    exponent = math.floor(log10_p)
+    mantissa = 10 ** (log10_p - exponent)
+    if round(mantissa, digits - 1) >= 10:  # 四捨五入進位到 10.000
+        mantissa /= 10
+        exponent += 1
+    return f"{mantissa:.{digits - 1}f}e{exponent:+d}"
+
+def precise_power(p, n, digits=30):
+    """
+    需要更多位有效數字時才用的高精度版本 (選用)
+    不直接算 p**n (decimal 的指數範圍也有限，n 很大時會變成 0)，
+    而是用足夠的精度算 n log10(p)，再拆成 尾數 × 10^指數
+    輸入: p 機率 (可以是字串如 '0.5'，避免 float 的二進位誤差), n 次數, digits 有效位數
+    輸出: (mantissa, exponent)，mantissa 為 decimal.Decimal
+    """
+    with decimal.localcontext() as ctx:
+        # n log10(p) 的整數部分會吃掉 len(str(n)) 位精度，要額外補上
+        ctx.prec = digits + len(str(abs(int(n)))) + 10
+        log10_p = decimal.Decimal(p).log10() * n
+        exponent = int(log10_p.to_integral_value(rounding=decimal.ROUND_FLOOR))
+        mantissa = decimal.Decimal(10) ** (log10_p - exponent)
+        ctx.prec = digits
+        return +mantissa, exponent
+
+
+# --- 範例測試 ---
+if __name__ == "__main__":
+    import time
+
+    ## 1. 連續投擲 10000 次全部正面 (與 Ch8.py、1.py 相同的問題)
+    print("================== 1. 0.5^10000 ==================")
+    lp = log_power(0.5, 10000)
+    print(f"float 直接相乘: {0.5 ** 10000}")
+    print(f"對數機率: {lp:.4f}, 換算: {to_scientific(lp)}")
+    mantissa, exponent = precise_power("0.5", 10000, digits=40)
+    print(f"高精度 (40 位): {mantissa}e{exponent}")
+
+    t = time.perf_counter()
+    with decimal.localcontext() as ctx:
+        ctx.prec = 3050
+        decimal.Decimal("0.5") ** 10000
+    slow = time.perf_counter() - t
+    t = time.perf_counter()
+    precise_power("0.5", 10000, digits=40)
+    print(f"decimal prec=3050: {slow * 1000:.2f} ms, precise_power: {(time.perf_counter() - t) * 1000:.2f} ms")
+    # 指數大到 10^11 時 float 的尾數只剩幾位可信，這時才需要高精度
+    mantissa, exponent = precise_power("0.5", 10**12, digits=10)
+    print(f"n = 10^12: float {to_scientific(log_power(0.5, 10**12))}, 高精度 {mantissa}e{exponent}")
+
+    ## 2. log 空間的加減
+    print("\n================== 2. logsumexp / log1mexp ==================")
+    a = np.array([-10000.0, -10001.0, -10002.0])
+    with np.errstate(divide="ignore"):
+        direct = np.log(np.sum(np.exp(a)))
+    print(f"log(Σ exp(a)) = {logsumexp(a):.10f} (直接計算: {direct})")
+    tiny = log_prob(1e-20)
+    print(f"log(1 - 1e-20) = {log1mexp(tiny)} (直接計算: {np.log(1 - 1e-20)})")
+    print(f"log(1 - (1 - 1e-12)) = {log1mexp(np.log1p(-1e-12)):.10f} (應為 {np.log(1e-12):.10f})")
+    print(f"1e-7 機率事件 10^9 次都不發生: {to_scientific(log_bernoulli(1e-7, 0, 10**9))}")
+
+    ## 3. 大量序列的 log 似然
+    print("\n================== 3. 串流計算大量序列的 log 似然 ==================")
+    rng = np.random.default_rng(0)
+    probs = np.array([0.5, 0.3, 0.2])
+    n_seq, length, step = 100000, 500, 50
+    chunks = [rng.choice(3, size=(n_seq, step), p=probs).astype(np.uint8) for _ in range(length // step)]
+    t = time.perf_counter()
+    ll = stream_log_likelihood(chunks, probs)
+    elapsed = time.perf_counter() - t
+    print(f"{n_seq} 條長度 {length} 的序列: {elapsed * 1000:.1f} ms, 平均 log 似然 {ll.mean():.2f}")
+    print(f"與一次計算的最大差異: {np.abs(ll - sequence_log_likelihood(np.concatenate(chunks, axis=1), probs)).max():.2e}")
+    print(f"理論期望值 -L·H = {length * np.sum(probs * np.log(probs)):.2f}")
+    print(f"最可能的一條: {to_scientific(ll.max())}, 最不可能: {to_scientific(ll.min())}")
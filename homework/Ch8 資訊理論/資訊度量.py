@@ -0,0 +1,136 @@
+import math
+import numpy as np
+
+# 熵、交叉熵、KL 散度、JS 散度、互資訊的向量化版本。
+# 機率分佈沿著 axis 排列，其他維度都當作批次，一次算完整批模型輸出。
+# 0 log 0 = 0 用遮罩處理 (只在 p > 0 的位置取 log)，不需要加 epsilon；
+# p > 0 但 q = 0 時交叉熵與 KL 散度為 inf，這是正確的數學結果。
+
+# ====== 1. 遮罩核心 ======
+def xlogy(x, y):
+    """x * log(y)，x = 0 的位置定義為 0 (即使 y = 0)"""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    mask = x > 0
+    log_y = np.zeros(x.shape)
+    with np.errstate(divide="ignore"):
+        np.log(y, out=log_y, where=mask)
+    return np.where(mask, x * log_y, 0.0)
+
+def rel_entr(x, y):
+    """x * log(x / y)，x = 0 的位置為 0，x > 0 且 y = 0 時為 inf"""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    mask = x > 0
+    ratio = np.ones(x.shape)
+    with np.errstate(divide="ignore"):
+        np.divide(x, y, out=ratio, where=mask)
+        return np.where(mask, x * np.log(ratio), 0.0)
+
+def _pairwise(p, q, axis):
+    """把分佈所在的軸移到最後，再讓 p 的每一個分佈對上 q 的每一個: (..., M, 1, K) 與 (..., 1, N, K)"""
+    p = np.moveaxis(np.asarray(p, dtype=float), axis, -1)
+    q = np.moveaxis(np.asarray(q, dtype=float), axis, -1)
+    return p[..., :, None, :], q[..., None, :, :]
+
+# ====== 2. 資訊度量 ======
+def entropy(p, axis=-1, base=2):
+    """H(P) = - Σ p(x) log p(x)，預設單位為 bits"""
+    return (0.0 - np.sum(xlogy(p, p), axis=axis)) / math.log(base)  # 0.0 - 避免輸出 -0.0
+
+def cross_entropy(p, q, axis=-1, base=2, pairwise=False):
+    """
+    H(P, Q) = - Σ p(x) log q(x)
+    pairwise=True 時 p 為 (..., M, K)、q 為 (..., N, K) (K 在 axis 上)，輸出 (..., M, N) 的所有配對
+    """
+    if not pairwise:
+        return (0.0 - np.sum(xlogy(p, q), axis=axis)) / math.log(base)
+    p = np.moveaxis(np.asarray(p, dtype=float), axis, -1)
+    q = np.moveaxis(np.asarray(q, dtype=float), axis, -1)
+    # 配對的和就是矩陣乘法 p @ log(q)^T；q = 0 的位置先放 0，
+    # 再把 "p > 0 但 q = 0" 的配對 (支撐集不包含) 設為 inf，不必展開成 M x N x K
+    positive = q > 0
+    log_q = np.zeros(q.shape)
+    np.log(q, out=log_q, where=positive)
+    result = (0.0 - p @ np.swapaxes(log_q, -1, -2)) / math.log(base)
+    outside = (p > 0).astype(float) @ np.swapaxes(~positive, -1, -2).astype(float)
+    return np.where(outside > 0, np.inf, result)
+
+def kl_divergence(p, q, axis=-1, base=2, pairwise=False):
+    """D_KL(P || Q) = Σ p(x) log(p(x) / q(x))，pairwise 的用法同 cross_entropy"""
+    if not pairwise:
+        return np.sum(rel_entr(p, q), axis=axis) / math.log(base)
+    # D_KL = H(P, Q) - H(P)；相減的捨入誤差可能產生極小的負數，KL 散度不會小於 0
+    h = entropy(np.moveaxis(np.asarray(p, dtype=float), axis, -1), base=base)
+    return np.maximum(cross_entropy(p, q, axis, base, pairwise=True) - h[..., :, None], 0.0)
+
+def js_divergence(p, q, axis=-1, base=2, pairwise=False):
+    """
+    JS(P, Q) = (D_KL(P || M) + D_KL(Q || M)) / 2，M = (P + Q) / 2
+    對稱且有界 (以 2 為底時介於 0 與 1 之間)，即使支撐集不同也不會是 inf
+    """
+    if pairwise:
+        p, q = _pairwise(p, q, axis)
+        axis = -1
+    else:
+        p, q = np.asarray(p, dtype=float), np.asarray(q, dtype=float)
+    m = (p + q) / 2
+    return (np.sum(rel_entr(p, m), axis=axis) + np.sum(rel_entr(q, m), axis=axis)) / (2 * math.log(base))
+
+def mutual_information(p_xy, axes=(-2, -1), base=2):
+    """
+    I(X; Y) = ΣΣ p(x,y) log(p(x,y) / (p(x) p(y)))
+    輸入: p_xy 聯合機率表，axes 為 (X 軸, Y 軸)，其餘維度為批次
+    """
+    p_xy = np.moveaxis(np.asarray(p_xy, dtype=float), axes, (-2, -1))
+    p_x = p_xy.sum(axis=-1, keepdims=True)
+    p_y = p_xy.sum(axis=-2, keepdims=True)
+    return np.sum(rel_entr(p_xy, p_x * p_y), axis=(-2, -1)) / math.log(base)
+
+
+# --- 範例測試 ---
+if __name__ == "__main__":
+    ## 1. 與 3.py 相同的例子
+    print("================== 1. 單一分佈 (3.py 的例子) ==================")
+    P = np.array([0.7, 0.2, 0.1])
+    Q = np.array([0.6, 0.3, 0.1])
+    P_xy = np.array([[0.1, 0.1],
+                     [0.0, 0.8]])
+    print(f"熵 {entropy(P):.4f}, 交叉熵 {cross_entropy(P, Q):.4f}, KL {kl_divergence(P, Q):.4f}, "
+          f"JS {js_divergence(P, Q):.4f}, 互資訊 {mutual_information(P_xy):.4f} bits")
+    print(f"交叉熵 - 熵 - KL = {cross_entropy(P, Q) - entropy(P) - kl_divergence(P, Q):.2e}")
+    print(f"有 0 的分佈: H([1, 0, 0]) = {entropy([1, 0, 0])}, "
+          f"KL([0.5, 0.5, 0] || [0.5, 0, 0.5]) = {kl_divergence([0.5, 0.5, 0], [0.5, 0, 0.5])}, "
+          f"JS = {js_divergence([0.5, 0.5, 0], [0.5, 0, 0.5]):.4f}")
+
+    ## 2. 批次: 一整批模型輸出對上真實標籤
+    print("\n================== 2. 批次計算 ==================")
+    rng = np.random.default_rng(42)
+    batch, classes = 100000, 10
+    logits = rng.normal(size=(batch, classes))
+    predictions = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    labels = np.eye(classes)[rng.integers(0, classes, batch)]  # one-hot 真實分佈
+    loss = cross_entropy(labels, predictions)
+    print(f"{batch} 筆: 平均交叉熵 {loss.mean():.4f} bits, 與 KL 的差 (one-hot 的熵為 0) "
+          f"{np.abs(loss - kl_divergence(labels, predictions)).max():.2e}")
+    # 分佈放在第 0 軸也可以
+    print(f"axis=0: {np.allclose(entropy(predictions.T, axis=0), entropy(predictions))}")
+    # 一批聯合機率表的互資訊
+    tables = rng.dirichlet(np.ones(6), size=1000).reshape(1000, 2, 3)
+    independent = np.einsum("bi,bj->bij", rng.dirichlet(np.ones(2), 1000), rng.dirichlet(np.ones(3), 1000))
+    print(f"1000 個聯合分佈的平均互資訊 {mutual_information(tables).mean():.4f}, "
+          f"獨立分佈的最大互資訊 {mutual_information(independent).max():.2e}")
+
+    ## 3. 所有配對的散度
+    print("\n================== 3. 所有配對 ==================")
+    A = rng.dirichlet(np.ones(classes), size=500)
+    B = rng.dirichlet(np.ones(classes), size=400)
+    ce = cross_entropy(A, B, pairwise=True)
+    kl = kl_divergence(A, B, pairwise=True)
+    js = js_divergence(A, B, pairwise=True)
+    i, j = 123, 321
+    print(f"矩陣大小 {kl.shape}, 與逐對計算的差: 交叉熵 {abs(ce[i, j] - cross_entropy(A[i], B[j])):.2e}, "
+          f"KL {abs(kl[i, j] - kl_divergence(A[i], B[j])):.2e}, JS {abs(js[i, j] - js_divergence(A[i], B[j])):.2e}")
+    print(f"KL(A, A) 對角線最大值 {np.diag(kl_divergence(A, A, pairwise=True)).max():.2e}, "
+          f"JS 範圍 [{js.min():.4f}, {js.max():.4f}]")
+    # 4.py 的不等式: 對每個 P，H(P, Q) >= H(P, P)
+    ok = np.all(cross_entropy(A, B, pairwise=True) >= entropy(A)[:, None] - 1e-12)
+    print(f"H(P, Q) >= H(P) 對所有 {ce.size} 個配對都成立: {ok}")